@@ -17,8 +17,12 @@
 # -----------------------------------------------------------------------------
 
 from logging import getLogger
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
 from inspect import signature
+from enum import IntEnum, auto
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait as futures_wait
+from threading import Lock, BoundedSemaphore
 
 # -----------------------------------------------------------------------------
 # Public Imports
@@ -38,6 +42,12 @@ from slackapptk.errors import SlackAppTKError
 from slackapptk.config import SlackAppConfig
 from slackapptk.request import view_inputs
 from slackapptk.cli import SlashCommandCLI
+from slackapptk.response import Response
+from slackapptk.view_updater import ViewUpdater
+from slackapptk.transport import SyncTransport
+from slackapptk.ioloop import IOLoopThread
+from slackapptk.utils.routes import RouteTrie
+from slackapptk.web.classes.view import View
 
 from slackapptk.request.all import (
     CommandRequest,
@@ -57,10 +67,28 @@ from slackapptk.request.action_event import (
 
 __all__ = [
     'SlackApp',
-    'SlashCommandCLI'
+    'SlashCommandCLI',
+    'ACTION_DISPATCH',
+    'COMMAND_POLICY'
 ]
 
 
+class ACTION_DISPATCH(IntEnum):
+    """
+    Identifies how the actions of a block_actions, or interactive_message,
+    payload are dispatched to the handlers.
+
+    FIRST - only the first action is dispatched
+    SEQUENTIAL - each action is dispatched in turn
+    CONCURRENT - the actions are dispatched concurrently in threads; note that
+        any thread-local context, for example the Flask session, is not
+        available to the handlers.
+    """
+    FIRST = auto()
+    SEQUENTIAL = auto()
+    CONCURRENT = auto()
+
+
 class SlackAppInteractiveHandlers(object):
     def __init__(self):
         self.block_action = pyee.EventEmitter()
@@ -69,15 +97,160 @@ class SlackAppInteractiveHandlers(object):
         self.imsg = pyee.EventEmitter()
         self.view = pyee.EventEmitter()
         self.view_closed = pyee.EventEmitter()
+        self.routes: Dict[str, RouteTrie] = dict()
+
+    def route(
+        self,
+        kind: str,
+        template: str,
+        handler: Optional[Callable] = None
+    ):
+        """
+        Bind the handler to a route template of the interactive handler kind,
+        for example:
+
+            @app.ic.route('block_action', 'ticket:{id}')
+            def on_ticket(rqst, action, id):
+                ...
+
+        The parameters extracted from the event ID, here the block_id, are
+        given to the handler as keyword arguments.  Handlers bound to an exact
+        event ID via the kind emitter take precedence over route templates.
+
+        Parameters
+        ----------
+        kind: str
+            The interactive handler kind; for example "block_action" or "view"
+
+        template: str
+            The route template; a parameter "{name}" matches one whole segment,
+            where segments are separated by ":" or "/".
+
+        handler: Callable
+            The handler; if not provided then this method is used as a
+            decorator.
+        """
+        if not isinstance(getattr(self, kind, None), pyee.EventEmitter):
+            raise SlackAppTKError(f'Unknown interactive handler kind: {kind}')
+
+        trie = self.routes.get(kind)
+        if trie is None:
+            trie = self.routes[kind] = RouteTrie()
+
+        if handler is None:
+            return partial(trie.add, template)
+
+        return trie.add(template, handler)
+
+    def match_route(self, kind: str, event: str) -> Optional[Callable]:
+        """
+        Return the handler of the route matching the event, with any extracted
+        parameters bound as keyword arguments; or None if no route matches.
+        """
+        trie = self.routes.get(kind)
+        found = trie.match(event) if trie else None
+        if found is None:
+            return None
+
+        handler, params = found
+        return partial(handler, **params) if params else handler
+
+
+def _callback_nargs(callback: Callable) -> int:
+    """
+    Return the number of parameters of the callback, excluding any that are
+    bound as keyword arguments; for example route parameters.
+    """
+    nargs = len(signature(callback).parameters)
+    if isinstance(callback, partial):
+        nargs -= len(callback.keywords)
+
+    return nargs
+
+
+class COMMAND_POLICY(IntEnum):
+    """
+    Identifies how a slash command is handled when the same User invokes the
+    command while their previous invocation is still running.  In each case
+    the duplicate is acknowledged immediately, so that the Slack ack deadline
+    is met however long the running invocation takes.
+
+    REJECT - the duplicate is not run; the User is sent an ephemeral
+        "already running" message.
+    COALESCE - the duplicate is not run; the result of the running invocation
+        is sent to the duplicate response_url when it completes.
+    QUEUE - the duplicate is run in the background after the running
+        invocation completes; its result is sent to its response_url.
+    """
+    REJECT = auto()
+    COALESCE = auto()
+    QUEUE = auto()
+
+
+class _CommandInFlight(object):
+    """ the in-flight registry of a slash command """
+
+    def __init__(
+        self,
+        policy: Optional[COMMAND_POLICY] = None,
+        max_concurrent: Optional[int] = None
+    ):
+        self.policy = policy
+        self.lock = Lock()
+        self.running: Dict[str, Future] = dict()
+        self.limit = BoundedSemaphore(max_concurrent) if max_concurrent else None
 
 
 class SlackAppCommands(object):
+
+    MSG_ALREADY_RUNNING = 'Your `{command}` command is already running.'
+    MSG_TOO_MANY_RUNNING = 'Too many `{command}` commands are running, please try again shortly.'
+    MSG_COALESCED = 'Your `{command}` command is already running, its result will be sent when it completes.'
+    MSG_QUEUED = 'Your `{command}` command is queued, its result will be sent when it completes.'
+
     def __init__(self, app):
         self.app = app
         self._registry = dict()
+        self._inflight: Dict[str, _CommandInFlight] = dict()
+
+        # runs the queued commands, and sends the deferred results, outside of
+        # the command request thread.
+
+        self._background = ThreadPoolExecutor(thread_name_prefix='slackapptk-cmd')
 
-    def register(self, parser):
+    def register(
+        self,
+        parser,
+        policy: Optional[COMMAND_POLICY] = None,
+        max_concurrent: Optional[int] = None
+    ):
+        """
+        Register the slash command parser.
+
+        Parameters
+        ----------
+        parser: SlackAppTKParser
+            The slash command parser; the parser prog is the command name.
+
+        policy: COMMAND_POLICY
+            If provided, determines how the command is handled when a User
+            invokes the command while their previous invocation is running.
+
+        max_concurrent: int
+            If provided, the maximum number of invocations of the command,
+            across all Users, that may run at the same time.  Invocations
+            beyond the limit are rejected unless the policy is QUEUE, in which
+            case they are run in the background when a slot is available.
+
+        Returns
+        -------
+        SlashCommandCLI
+        """
         cmd = self._registry[parser.prog] = SlashCommandCLI(parser=parser)
+
+        if policy or max_concurrent:
+            self._inflight[parser.prog] = _CommandInFlight(policy, max_concurrent)
+
         return cmd
 
     def run(
@@ -112,7 +285,142 @@ class SlackAppCommands(object):
             self.app.log.error(emsg)
             raise SlackAppTKError(emsg, name, rqst)
 
-        return slashcli.run(rqst)
+        inflight = self._inflight.get(name)
+        if not inflight:
+            return slashcli.run(rqst)
+
+        return self._run_inflight(inflight, slashcli, rqst)
+
+    def _reply_busy(self, rqst: CommandRequest, message: str):
+        # the reply is given in the ack body of the command request
+        return {'text': message.format(command=rqst.rqst_data['command'])}
+
+    def _run_inflight(
+        self,
+        inflight: _CommandInFlight,
+        slashcli: SlashCommandCLI,
+        rqst: CommandRequest
+    ):
+        policy = inflight.policy
+
+        # register this invocation as the User in-flight invocation; or if
+        # there is a User invocation already running, handle per the policy.
+        # A queued invocation replaces the running one as the User in-flight
+        # invocation, so that the next duplicate is queued after it.
+
+        with inflight.lock:
+            running = inflight.running.get(rqst.user_id) if policy else None
+            if running is None or policy == COMMAND_POLICY.QUEUE:
+                future = Future()
+                if policy:
+                    inflight.running[rqst.user_id] = future
+
+        if running is not None:
+            if policy == COMMAND_POLICY.REJECT:
+                return self._reply_busy(rqst, self.MSG_ALREADY_RUNNING)
+
+            if policy == COMMAND_POLICY.COALESCE:
+                running.add_done_callback(
+                    lambda done: self._background.submit(self._send_result, rqst, done)
+                )
+                return self._reply_busy(rqst, self.MSG_COALESCED)
+
+            self._background.submit(self._run_queued, inflight, slashcli, rqst, future, running)
+            return self._reply_busy(rqst, self.MSG_QUEUED)
+
+        limit = inflight.limit
+
+        if limit and not limit.acquire(blocking=False):
+            if policy == COMMAND_POLICY.QUEUE:
+                self._background.submit(self._run_queued, inflight, slashcli, rqst, future, None)
+                return self._reply_busy(rqst, self.MSG_QUEUED)
+
+            future.set_result('')
+            self._release(inflight, rqst, future)
+            return self._reply_busy(rqst, self.MSG_TOO_MANY_RUNNING)
+
+        return self._run_command(inflight, slashcli, rqst, future, limit)
+
+    def _run_command(
+        self,
+        inflight: _CommandInFlight,
+        slashcli: SlashCommandCLI,
+        rqst: CommandRequest,
+        future: Future,
+        limit: Optional[BoundedSemaphore]
+    ):
+        try:
+            result = slashcli.run(rqst)
+            future.set_result(result)
+            return result
+
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+
+        finally:
+            if limit:
+                limit.release()
+
+            self._release(inflight, rqst, future)
+
+    def _run_queued(
+        self,
+        inflight: _CommandInFlight,
+        slashcli: SlashCommandCLI,
+        rqst: CommandRequest,
+        future: Future,
+        previous: Optional[Future]
+    ):
+        # run in the background, after the previous User invocation and once
+        # a concurrency slot is available; the request is already acked.
+
+        if previous is not None:
+            futures_wait([previous])
+
+        limit = inflight.limit
+        if limit:
+            limit.acquire()
+
+        try:
+            result = self._run_command(inflight, slashcli, rqst, future, limit)
+
+        except Exception as exc:
+            self.app.log.error(f"Queued command {rqst.rqst_data['command']} failed: {exc}")
+            return
+
+        self._send_result(rqst, result)
+
+    @staticmethod
+    def _release(inflight: _CommandInFlight, rqst: CommandRequest, future: Future):
+        if not inflight.policy:
+            return
+
+        with inflight.lock:
+            if inflight.running.get(rqst.user_id) is future:
+                del inflight.running[rqst.user_id]
+
+    def _send_result(self, rqst: CommandRequest, result):
+        """ send the command result, or result future, to the response_url """
+        if isinstance(result, Future):
+            if result.exception():
+                self.app.log.error(f"Command {rqst.rqst_data['command']} failed: {result.exception()}")
+                return
+
+            result = result.result()
+
+        # an empty result means the command replied by itself
+        if not result:
+            return
+
+        if isinstance(result, str):
+            result = {'text': result}
+
+        try:
+            Response(rqst).send_response(**result)
+
+        except Exception as exc:
+            self.app.log.error(f"Unable to send command {rqst.rqst_data['command']} result: {exc}")
 
 
 class SlackApp(object):
@@ -148,6 +456,71 @@ class SlackApp(object):
 
         self.config = SlackAppConfig()
 
+        # the keep-alive HTTP connection pool used to POST to response_url
+        # values, and to call the Web API, without an event loop.
+
+        self.transport = SyncTransport()
+
+        # coordinates views.update calls for the same view_id made from
+        # multiple threads; see Modal.update
+
+        self.view_updater = ViewUpdater()
+
+        # Form schemas bound to view callback_id values; see Form.bind
+
+        self.forms = dict()
+
+        # the view_state.ViewStateStore, if configured, used to keep the Modal
+        # state on the server rather than in the view private_metadata.
+
+        self.view_state = None
+
+        # how multiple actions in a single interactive payload are dispatched
+        # to the handlers; see ACTION_DISPATCH
+
+        self.action_dispatch = ACTION_DISPATCH.SEQUENTIAL
+
+        # the job subsystem, assigned when a jobs.JobManager is created for
+        # this app.
+
+        self.jobs = None
+
+        # the registry.SharedCallbackRegistry, if configured, used to resolve
+        # callbacks registered by other app processes.
+
+        self.shared_registry = None
+
+        # the process pool used by the process.run_in_process handlers; the
+        # pool is created on first use with process_pool_workers processes.
+
+        self.process_pool_workers = None
+        self._process_pool = None
+        self._process_pool_lock = Lock()
+
+        # the background I/O loop thread used by sync code to make async Slack
+        # calls; the thread is created on first use.
+
+        self._io = None
+        self._io_lock = Lock()
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_pool_workers
+                )
+
+            return self._process_pool
+
+    @property
+    def io(self) -> IOLoopThread:
+        with self._io_lock:
+            if self._io is None:
+                self._io = IOLoopThread(token=self.config.token)
+
+            return self._io
+
     # -------------------------------------------------------------------------
     # HANDLER: slash commands that use the SlashCLI mechanism
     # -------------------------------------------------------------------------
@@ -233,14 +606,13 @@ class SlackApp(object):
         """
         event = rqst.block_id
 
-        callback = first(self.ic.select.listeners(event))
+        callback = self._get_callback('select', event)
         if not callback:
             msg = f"No handler for ext selector event: {event}"
             self.log.error(msg)
             return
 
-        cal_sig = signature(callback)
-        if len(cal_sig.parameters) == 1:
+        if _callback_nargs(callback) == 1:
             return callback(rqst)
 
         action = ActionEvent(
@@ -278,6 +650,30 @@ class SlackApp(object):
 
         return {res_type: extract_json(res_list)}
 
+    # -------------------------------------------------------------------------
+    # PRIVATE callback lookup
+    # -------------------------------------------------------------------------
+
+    def _get_callback(
+        self,
+        kind: str,
+        event: str
+    ) -> Optional[Callable]:
+        """
+        Return the callback bound to the event of the interactive handler
+        kind, for example "view".  Callbacks bound to the exact event in this
+        process take precedence over route templates, and those over the
+        shared registry, if configured.
+        """
+        callback = first(getattr(self.ic, kind).listeners(event))
+        if callback is None:
+            callback = self.ic.match_route(kind, event)
+
+        if callback is None and self.shared_registry:
+            callback = self.shared_registry.lookup(kind, event)
+
+        return callback
+
     # -------------------------------------------------------------------------
     # PRIVATE Request handlers - per payload type
     # -------------------------------------------------------------------------
@@ -288,34 +684,53 @@ class SlackApp(object):
     def _handle_view_action(
         self,
         rqst: ViewRequest,
-        ic_view: pyee.EventEmitter
+        kind: str
     ):
         event = rqst.view.callback_id
-        callback = first(ic_view.listeners(event))
+        callback = self._get_callback(kind, event)
 
         if callback is None:
-            msg = f"No handler for view event: {event}"
-            self.log.error(msg)
+            # a modal may notify on close only so that its stored state is
+            # discarded; for example a paginated modal.
+
+            if kind != 'view_closed':
+                self.log.error(f"No handler for view event: {event}")
             return
 
+        # if a form is bound to the view, then the submission is validated
+        # before the callback is invoked, whatever its signature; the errors
+        # are returned to the User.
+
+        form = self.forms.get(event)
+        form_values = None
+
+        if form and rqst.rqst_type == 'view_submission':
+            input_values = view_inputs.get_input_values(
+                callback_id=event,
+                state_values=rqst.view.state_values
+            )
+            form_values, errors = form.parse(input_values)
+            if errors:
+                return View.error_response(errors)
+
         # get the signature of the callback to determine if the callback
         # expects any input results.  If not, then invoke the callback now with
         # the received event.
 
-        cal_sig = signature(callback)
-        if len(cal_sig.parameters) == 1:
+        if _callback_nargs(callback) == 1:
             return callback(rqst)
 
-        # At this point the caller is expecting input value results, so we need
-        # to extract them from the view state values.
+        if form_values is not None:
+            return callback(rqst, form_values)
 
-        vsv = rqst.view.state_values
+        # At this point the caller is expecting input value results, so we need
+        # to extract them from the view state values.  The extractor for the
+        # view layout is cached by callback_id.
 
-        input_values = {
-            action_id: view_inputs.get_input_value(action_ele)
-            for block_id, block_ele in vsv.items()
-            for action_id, action_ele in block_ele.items()
-        }
+        input_values = view_inputs.get_input_values(
+            callback_id=event,
+            state_values=rqst.view.state_values
+        )
 
         return callback(rqst, input_values)
 
@@ -323,13 +738,24 @@ class SlackApp(object):
         self,
         rqst: ViewRequest
     ):
-        return self._handle_view_action(rqst, self.ic.view)
+        return self._handle_view_action(rqst, 'view')
 
     def _handle_view_closed_action(
         self,
         rqst: ViewRequest
     ):
-        return self._handle_view_action(rqst, self.ic.view_closed)
+        self.view_updater.forget(rqst.view.view_id)
+
+        try:
+            return self._handle_view_action(rqst, 'view_closed')
+
+        finally:
+            from slackapptk.modal import discard_pages
+
+            if self.view_state:
+                self.view_state.discard_view(rqst.view.private_metadata)
+
+            discard_pages(self, rqst.rqst_data['view'])
 
     # -------------------------------------------------------------------------
     # PRIVATE request handlers - per payload type
@@ -343,7 +769,9 @@ class SlackApp(object):
         This method is called by handle_interactive_request when the User
         generates an event from a block actions element.  As a result, the code
         associated with this block ID is invoked to ultimately process the
-        action event.
+        action event.  When the payload contains multiple actions, each is
+        dispatched per the app action_dispatch policy and the handler
+        responses are merged.
 
         If no callback is associated, the error is logged.
 
@@ -362,27 +790,31 @@ class SlackApp(object):
         dict
             Response message to send back to api.slack.com
         """
-        payload_action = first(rqst.rqst_data['actions'])
-        event = payload_action['block_id']
-        callback = first(self.ic.block_action.listeners(event))
+        calls = list()
 
-        if callback is None:
-            msg = f"No handler for block action event: {event}"
-            self.log.error(msg)
-            return
+        for payload_action in self._payload_actions(rqst):
+            event = payload_action['block_id']
+            callback = self._get_callback('block_action', event)
 
-        # check the signature of the callback.  If the callback is not
-        # expecting the action value, then invoke the callback now.
+            if callback is None:
+                msg = f"No handler for block action event: {event}"
+                self.log.error(msg)
+                continue
 
-        sig_cal = signature(callback)
-        if len(sig_cal.parameters) == 1:
-            return callback(rqst)
+            # check the signature of the callback.  If the callback is not
+            # expecting the action value, then invoke the callback now.
+
+            if _callback_nargs(callback) == 1:
+                calls.append(partial(callback, rqst))
+                continue
 
-        # the callback is expecting the action payload, so obtain that now and
-        # then invoke the callback
+            # the callback is expecting the action payload, so obtain that now
+            # and then invoke the callback
 
-        action = BlockActionEvent(payload_action)
-        return callback(rqst, action)
+            action = BlockActionEvent(payload_action)
+            calls.append(partial(callback, rqst, action))
+
+        return self._dispatch_actions(calls)
 
     def _handle_dialog_submit(
         self,
@@ -390,7 +822,7 @@ class SlackApp(object):
     ):
         event = rqst.rqst_data['callback_id']
         submission = rqst.rqst_data['submission']
-        callback = first(self.ic.dialog.listeners(event))
+        callback = self._get_callback('dialog', event)
 
         if callback is None:
             msg = f'No dialog handler for event {event}'
@@ -414,13 +846,59 @@ class SlackApp(object):
         -------
         """
         event = rqst.rqst_data['callback_id']
-        payload_action = first(rqst.rqst_data['actions'])
-        action = InteractiveMessageActionEvent(payload_action)
-        callback = first(self.ic.imsg.listeners(event))
+        callback = self._get_callback('imsg', event)
 
         if not callback:
             msg = f"No handler for IMSG action event: {event}"
             self.log.error(msg)
             return
 
-        return callback(rqst, action)
+        return self._dispatch_actions([
+            partial(callback, rqst, InteractiveMessageActionEvent(payload_action))
+            for payload_action in self._payload_actions(rqst)
+        ])
+
+    # -------------------------------------------------------------------------
+    # PRIVATE multi-action dispatch
+    # -------------------------------------------------------------------------
+
+    def _payload_actions(self, rqst) -> List[Dict]:
+        actions = rqst.rqst_data['actions']
+        if self.action_dispatch == ACTION_DISPATCH.FIRST:
+            return actions[:1]
+
+        return actions
+
+    def _dispatch_actions(self, calls: List[Callable]):
+        """
+        Invoke the action handler calls per the action_dispatch policy, and
+        merge the handler responses into a single response.
+        """
+        if self.action_dispatch == ACTION_DISPATCH.CONCURRENT and len(calls) > 1:
+            with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+                futures = [pool.submit(call) for call in calls]
+                results = [future.result() for future in futures]
+        else:
+            results = [call() for call in calls]
+
+        return self._merge_responses(results)
+
+    def _merge_responses(self, results: List):
+        responses = [res for res in results if res]
+
+        if len(responses) <= 1:
+            return first(responses, default=first(results))
+
+        merged = dict()
+
+        for res in responses:
+            if not isinstance(res, dict):
+                self.log.warning(f'Discarding non-dict action response: {res}')
+                continue
+
+            for key in merged.keys() & res.keys():
+                self.log.warning(f'Action response key conflict, overriding: {key}')
+
+            merged.update(res)
+
+        return merged or responses[-1]
@@ -7,9 +7,13 @@ parsing utilizing the Python standard argparse module.
 # System Imports
 # -----------------------------------------------------------------------------
 
-from typing import Optional, Dict, Text, NoReturn
+from typing import Optional, Dict, Text, NoReturn, Tuple, Hashable
 
-from inspect import stack, signature
+from inspect import (
+    stack, signature, isgenerator, isasyncgen,
+    isgeneratorfunction, isasyncgenfunction
+)
+from functools import partial
 from argparse import ArgumentParser, SUPPRESS, Namespace
 import logging
 
@@ -27,9 +31,11 @@ import pyee
 # Private Imports
 # -----------------------------------------------------------------------------
 
-from slackapptk.response import Response
+from slackapptk.response import Responder
 from slackapptk.request.any import AnyRequest
 from slackapptk.errors import SlackAppTKError
+from slackapptk.stream import stream_output
+from slackapptk.utils.ttlcache import TTLCache
 
 # -----------------------------------------------------------------------------
 #
@@ -169,8 +175,6 @@ class SlackAppTKParser(ArgumentParser):
         return None
 
     def send_help(self, rqst: AnyRequest) -> None:
-        resp = Response(rqst)
-
         cmd = rqst.rqst_data['command']
         txt = rqst.rqst_data['text']
 
@@ -181,20 +185,18 @@ class SlackAppTKParser(ArgumentParser):
 
         helptext = self.format_help()
 
-        resp.send_response(text=(
+        rqst.responder.send_response(text=(
             f'Hi <@{rqst.user_id}>, here is help on the `{cmd_str}` command:\n\n'
             f"```{helptext}```")
         )
 
     @staticmethod
     def send_version(rqst, versiontext) -> None:
-        Response(rqst).send_response(text=versiontext)
+        rqst.responder.send_response(text=versiontext)
 
     @staticmethod
     def send_help_on_error(rqst, errmsg, helptext):
-        resp = Response(rqst)
-
-        atts = resp['attachments'] = list()
+        atts = list()
         atts.append(dict(
             color="#FF0000",    # red
             pretext=f'Hi <@{rqst.user_id}>, I could not run your command',
@@ -208,7 +210,10 @@ class SlackAppTKParser(ArgumentParser):
             text=f"```{helptext}```"
         ))
 
-        resp.send()
+        # the error is posted in the channel, as it was when sent via the
+        # Web API.
+
+        rqst.responder.send_response(response_type='in_channel', attachments=atts)
 
 
 class SlashCommandCLI(object):
@@ -218,6 +223,64 @@ class SlashCommandCLI(object):
         self.parser = parser
         self.ic = pyee.EventEmitter()
         self.cli = pyee.EventEmitter()
+        self.caches: Dict[str, Tuple[TTLCache, bool]] = dict()
+
+    def cache(
+        self,
+        event: str,
+        ttl: Optional[float] = 30.0,
+        maxsize: Optional[int] = 128,
+        per_user: Optional[bool] = False
+    ) -> None:
+        """
+        Cache the results of the command handler for the event, for example
+        cli.cache(status_parser.prog, ttl=60).  The results are keyed by the
+        command arguments, and concurrent invocations with the same arguments
+        share one invocation of the handler.
+
+        The cached result is the command ack; that is the handler return
+        value, or the reply the handler gave via the request responder.  An
+        empty ack is not cached, for example when the handler replies via
+        Response(rqst).send_response() and returns None, so such a handler is
+        run for each invocation.  Handlers that are generators are not cached.
+
+        Parameters
+        ----------
+        event: str
+            The command event, as used with cli.on()
+
+        ttl: float
+            The number of seconds a result is cached
+
+        maxsize: int
+            The maximum number of results cached for the event
+
+        per_user: bool
+            If True, the results are also keyed by the User ID; for example
+            when the result is specific to the User.
+        """
+        self.caches[event] = (TTLCache(ttl=ttl, maxsize=maxsize), per_user)
+
+    def invalidate(
+        self,
+        event: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> int:
+        """
+        Discard the cached results of the event, or of all events; if user_id
+        is given, then only the results cached for that User.
+
+        Returns
+        -------
+        int
+            The number of results discarded.
+        """
+        caches = [self.caches[event]] if event in self.caches else (
+            [] if event else list(self.caches.values())
+        )
+
+        predicate = (lambda key: key[0] == user_id) if user_id else None
+        return sum(cache.invalidate(predicate=predicate) for cache, _ in caches)
 
     def run(self, rqst, event=None):
 
@@ -259,11 +322,16 @@ class SlashCommandCLI(object):
         ns = Namespace()
         setattr(ns, NS_ATTR_RESP, rqst)
 
+        # replies made before the command is acknowledged, for example the
+        # command help, are returned as the ack body.
+
+        responder = rqst.responder = Responder(rqst)
+
         try:
             ns_args = self.parser.parse_args(rqst.argv, namespace=ns)
 
         except SlackAppTKParserExit:
-            return ''
+            return responder.ack()
 
         # the ns_args will have the cmd event _OR_ the User entered only up to
         # a sub parser name which will be used to identify the event.
@@ -277,14 +345,78 @@ class SlashCommandCLI(object):
                 f"{cmd_str}: no handler for event '{event}'"
             )
 
+        cached = self.caches.get(event)
+        if cached is None or isgeneratorfunction(handler) or isasyncgenfunction(handler):
+            return self._run_handler(handler, rqst, ns_args, responder)
+
+        cache, per_user = cached
+        key = (rqst.user_id if per_user else None, _namespace_key(ns_args))
+
+        result = cache.get_or_compute(
+            key, partial(self._run_handler, handler, rqst, ns_args, responder)
+        )
+
+        # the result may be that of another invocation, so this request is
+        # acknowledged now.
+
+        responder.ack()
+        return result
+
+    @staticmethod
+    def _run_handler(handler, rqst, ns_args, responder):
         # detect if the callback wants the namespace parameters or not and
         # invoke the handler accordingly.
 
-        sig_cal = signature(handler)
-        if len(sig_cal.parameters) == 1:
-            return handler(rqst)
+        try:
+            sig_cal = signature(handler)
+            if len(sig_cal.parameters) == 1:
+                result = handler(rqst)
+            else:
+                result = handler(rqst, ns_args)
+
+        except BaseException:
+            # the handler failed, so any reply kept for the ack body is sent
+            # via the response_url.
+
+            body = responder.ack()
+            if body:
+                responder.send_response(**body)
+            raise
+
+        # a handler that is a generator streams the output; the chunks are
+        # posted in the background, and the command is acknowledged now.
+
+        if isgenerator(result) or isasyncgen(result):
+            stream_output(rqst, result)
+            result = None
+
+        return responder.ack(result)
+
+
+def _freeze(value) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+
+    if isinstance(value, set):
+        return frozenset(map(_freeze, value))
+
+    try:
+        hash(value)
+        return value
+
+    except TypeError:
+        return repr(value)
+
 
-        return handler(rqst, ns_args)
+def _namespace_key(ns_args: Namespace) -> Tuple:
+    """ return the command arguments as a cache key, without the request """
+    return tuple(sorted(
+        (name, _freeze(value)) for name, value in vars(ns_args).items()
+        if name != NS_ATTR_RESP
+    ))
 
 
 # -----------------------------------------------------------------------------
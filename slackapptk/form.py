@@ -0,0 +1,198 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the declarative Form schema used to render the input
+blocks of a View and to parse and validate the view_submission input values.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Callable, Iterable, Dict, Tuple, Any
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.web.classes.blocks import InputBlock
+from slack.web.classes.elements import InputInteractiveElement, PlainTextInputElement
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.errors import SlackAppTKError
+from slackapptk.web.classes.view import View
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'Form',
+    'FormField'
+]
+
+
+class FormField(object):
+
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        element: Optional[InputInteractiveElement] = None,
+        required: Optional[bool] = True,
+        convert: Optional[Callable] = None,
+        validators: Optional[Iterable[Callable]] = (),
+        hint: Optional[str] = None,
+        error: Optional[str] = None
+    ):
+        """
+        A single input field of a Form.
+
+        Parameters
+        ----------
+        name: str
+            The field name, used as both the input block_id and the element
+            action_id, and as the key of the parsed form values.
+
+        label: str
+            The input block label
+
+        element: InputInteractiveElement
+            The input element; by default a plain-text input.  If provided
+            the element action_id is set to `name`.
+
+        required: bool
+            When True, a missing value is a submission error.
+
+        convert: Callable
+            If provided, called with the input value to convert it to the
+            field type, for example `int` or `validators.validate_ipaddress`.
+            A conversion that returns None or raises ValueError is a
+            submission error.
+
+        validators: Iterable[Callable]
+            Each is called with the converted value and returns an error
+            message string, or None if the value is valid.
+
+        hint: str
+            The input block hint
+
+        error: str
+            The error message used when the conversion fails.
+        """
+        self.name = name
+        self.label = label
+        self.element = element or PlainTextInputElement()
+        self.element.action_id = name
+        self.required = required
+        self.convert = convert
+        self.validators = tuple(validators)
+        self.hint = hint
+        self.error = error or f'Invalid {label}'
+
+    def block(self) -> InputBlock:
+        return InputBlock(
+            block_id=self.name,
+            label=self.label,
+            element=self.element,
+            hint=self.hint,
+            optional=not self.required
+        )
+
+    def parse(self, value) -> Tuple[Any, Optional[str]]:
+        """
+        Returns
+        -------
+        tuple
+            The converted value and the error message, if any.
+        """
+        if value in (None, '', []):
+            return None, ('This field is required' if self.required else None)
+
+        if self.convert:
+            try:
+                value = self.convert(value)
+            except (ValueError, TypeError):
+                value = None
+
+            if value is None:
+                return None, self.error
+
+        for validator in self.validators:
+            errmsg = validator(value)
+            if errmsg:
+                return value, errmsg
+
+        return value, None
+
+
+class Form(object):
+    """
+    A Form is a declarative schema of FormField that is used to render the
+    input blocks of a View, and to parse and validate all of the fields of
+    the view_submission in one pass.  A Form bound to a view callback_id is
+    applied automatically by the SlackApp before the view callback is invoked;
+    see Modal(form=...).
+    """
+
+    def __init__(self, fields: Iterable[FormField]):
+        self.fields = tuple(fields)
+
+        names = [field.name for field in self.fields]
+        if len(set(names)) != len(names):
+            raise SlackAppTKError('Form field names must be unique', names)
+
+    def render(self, view: View) -> View:
+        """ add the form input blocks to the view """
+        view.blocks.extend(field.block() for field in self.fields)
+        return view
+
+    def parse(
+        self,
+        input_values: Dict
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Parse and validate the view_submission input values.
+
+        Parameters
+        ----------
+        input_values: dict
+            The view input values keyed by action-id
+
+        Returns
+        -------
+        tuple
+            The dict of converted values keyed by field name, and the dict of
+            error messages keyed by block-id suitable for View.error_response
+        """
+        values, errors = dict(), dict()
+
+        for field in self.fields:
+            value, errmsg = field.parse(input_values.get(field.name))
+            values[field.name] = value
+            if errmsg:
+                errors[field.name] = errmsg
+
+        return values, errors
+
+    def bind(self, app, callback_id: str) -> 'Form':
+        """ bind this form to the app for the given view callback_id """
+        app.forms[callback_id] = self
+        return self
@@ -0,0 +1,228 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the IOLoopThread, a background thread that runs one
+persistent asyncio event loop with a pooled aiohttp session.  Sync code, for
+example a command handler running in a background thread, submits coroutines
+to the loop and gets a concurrent.futures.Future back, so any number of
+threads can make concurrent async Slack calls without each running its own
+event loop.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Dict, Coroutine, Any
+import asyncio
+from concurrent.futures import Future
+from threading import Thread, Lock, Event
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+import aiohttp
+from slack.web.client import WebClient
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = ['IOLoopThread']
+
+
+class IOLoopThread(object):
+    """
+    The IOLoopThread is started on first use; for example:
+
+        future = app.io.api_call('chat_postMessage', channel=channel, text='hi')
+        res = future.result()
+
+        future = app.io.submit(my_coroutine())
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        max_connections: Optional[int] = 100,
+        timeout: Optional[float] = 30.0,
+        name: Optional[str] = 'slackapptk-io'
+    ):
+        """
+        Parameters
+        ----------
+        token: str
+            The default token of the Slack clients
+
+        max_connections: int
+            The maximum number of connections of the aiohttp session
+
+        timeout: float
+            The timeout in seconds of each aiohttp request
+
+        name: str
+            The thread name
+        """
+        self.token = token
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._thread: Optional[Thread] = None
+        self._clients: Dict[str, WebClient] = dict()
+        self._lock = Lock()
+
+    @property
+    def running(self) -> bool:
+        # the session is created last when the thread is started
+        return self.session is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """ start the thread, if it is not running """
+        with self._lock:
+            if self.running:
+                return
+
+            ready = Event()
+            self.loop = asyncio.new_event_loop()
+            self._thread = Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+            self.session = asyncio.run_coroutine_threadsafe(
+                self._create_session(), self.loop
+            ).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """ close the session and stop the thread """
+        with self._lock:
+            if not self.running:
+                return
+
+            loop, thread = self.loop, self._thread
+
+        if self.session:
+            asyncio.run_coroutine_threadsafe(self.session.close(), loop).result(timeout)
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+        with self._lock:
+            self._clients.clear()
+            self.session, self._thread = None, None
+
+    def _run(self, ready: Event):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    async def _create_session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    # -------------------------------------------------------------------------
+    # coroutine submission
+    # -------------------------------------------------------------------------
+
+    def submit(self, coro: Coroutine) -> Future:
+        """
+        Run the coroutine on the loop, starting the thread if needed.  This
+        method may be called from any thread other than the loop thread.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the coroutine result.
+        """
+        if not self.running:
+            self.start()
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """ run the coroutine on the loop, and wait for the result """
+        return self.submit(coro).result(timeout)
+
+    # -------------------------------------------------------------------------
+    # Slack calls
+    # -------------------------------------------------------------------------
+
+    def client(self, token: Optional[str] = None) -> WebClient:
+        """
+        Return the async WebClient for the token, bound to the loop and the
+        pooled session.  The client methods must be called on the loop, for
+        example within a coroutine given to submit(); see api_call().
+        """
+        if not self.running:
+            self.start()
+
+        token = token or self.token
+
+        with self._lock:
+            client = self._clients.get(token)
+            if client is None:
+                client = self._clients[token] = WebClient(
+                    token=token,
+                    run_async=True,
+                    loop=self.loop,
+                    session=self.session
+                )
+
+            return client
+
+    def api_call(self, method: str, token: Optional[str] = None, **kwargs) -> Future:
+        """
+        Call the WebClient method, for example "chat_postMessage", on the loop.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the SlackResponse.
+        """
+        client = self.client(token)
+
+        # the client method must be called on the loop thread, as it
+        # schedules the request on the loop.
+
+        async def call():
+            return await getattr(client, method)(**kwargs)
+
+        return self.submit(call())
+
+    def post_json(self, url: str, payload: Dict) -> Future:
+        """
+        POST the payload as JSON to the URL, for example a response_url, on
+        the loop.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future of the HTTP status code.
+        """
+        async def post():
+            async with self.session.post(url, json=payload) as resp:
+                await resp.read()
+                return resp.status
+
+        return self.submit(post())
@@ -0,0 +1,567 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the job subsystem used to run long-running work, for
+example on behalf of a slash command, outside of the API request handler.
+Jobs are recorded in a durable SQLite queue so that queued jobs, and running
+jobs whose worker stopped, are resumed when an app process starts.  Each job
+is claimed by one job manager before it is run, so that jobs are run once
+when several app processes share the queue.  Job progress is reflected into
+a Slack message or modal view, and a job can be cancelled from a button in
+that surface.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Callable, Dict, List, Any, Union
+import json
+import sqlite3
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from threading import Thread, Event
+from time import time, monotonic
+from uuid import uuid4
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.web.client import WebClient
+from slack.web.classes.blocks import SectionBlock, ActionsBlock
+from slack.web.classes.elements import ButtonElement
+from slack.web.classes.objects import PlainTextObject
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.errors import SlackAppTKError
+from slackapptk.messenger import Messenger
+from slackapptk.web.classes.view import View
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'JobManager',
+    'JobContext',
+    'JobStore',
+    'JobCancelled',
+    'JOB_CANCEL_BLOCK_ID'
+]
+
+JOB_CANCEL_BLOCK_ID = 'slackapptk.jobs.cancel'
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+JOB_ACTIVE = (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobCancelled(Exception):
+    """
+    Raised by JobContext.check_cancelled() to stop a job that was cancelled.
+    """
+    pass
+
+
+class JobStore(object):
+    """
+    The durable SQLite job queue.  A new connection is used for each
+    operation so that the store can be shared by threads and by worker
+    processes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            params TEXT NOT NULL,
+            status TEXT NOT NULL,
+            progress TEXT,
+            result TEXT,
+            error TEXT,
+            surface TEXT,
+            cancel INTEGER NOT NULL DEFAULT 0,
+            owner TEXT,
+            lease REAL,
+            created REAL NOT NULL,
+            updated REAL NOT NULL
+        )
+    """
+
+    # columns added to the schema after the first release; these are added
+    # to an existing queue when it is opened.
+
+    MIGRATIONS = (
+        ('owner', 'ALTER TABLE jobs ADD COLUMN owner TEXT'),
+        ('lease', 'ALTER TABLE jobs ADD COLUMN lease REAL')
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._execute(self.SCHEMA)
+
+        columns = {row['name'] for row in self._execute('PRAGMA table_info(jobs)')}
+        for column, sql in self.MIGRATIONS:
+            if column not in columns:
+                self._execute(sql)
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def _execute(self, sql, *args):
+        with closing(self._connect()) as db, db:
+            return db.execute(sql, args).fetchall()
+
+    def add(self, job_id: str, name: str, params: Dict, surface: Optional[Dict]):
+        now = time()
+        self._execute(
+            'INSERT INTO jobs (id, name, params, status, surface, created, updated) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            job_id, name, json.dumps(params), JOB_QUEUED,
+            json.dumps(surface) if surface else None, now, now
+        )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        rows = self._execute('SELECT * FROM jobs WHERE id = ?', job_id)
+        return dict(rows[0]) if rows else None
+
+    def update(self, job_id: str, **fields):
+        fields['updated'] = time()
+        columns = ', '.join(f'{col} = ?' for col in fields)
+        self._execute(
+            f'UPDATE jobs SET {columns} WHERE id = ?',
+            *fields.values(), job_id
+        )
+
+    def claim(self, job_id: str, owner: str, lease_ttl: float) -> bool:
+        """
+        Claim the job for the owner, if the job is queued, or if it is running
+        and the lease of its owner has expired.  The claim is atomic, so that
+        only one of the job managers sharing the queue runs the job.
+
+        Returns
+        -------
+        bool
+            True if the job was claimed.
+        """
+        now = time()
+        with closing(self._connect()) as db, db:
+            cursor = db.execute(
+                'UPDATE jobs SET status = ?, owner = ?, lease = ?, updated = ? '
+                'WHERE id = ? AND (status = ? OR '
+                '(status = ? AND (lease IS NULL OR lease < ?)))',
+                (JOB_RUNNING, owner, now + lease_ttl, now,
+                 job_id, JOB_QUEUED, JOB_RUNNING, now)
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, owner: str, lease_ttl: float):
+        """ extend the lease of the running jobs of the owner """
+        self._execute(
+            'UPDATE jobs SET lease = ? WHERE owner = ? AND status = ?',
+            time() + lease_ttl, owner, JOB_RUNNING
+        )
+
+    def request_cancel(self, job_id: str):
+        self.update(job_id, cancel=1)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        rows = self._execute('SELECT cancel FROM jobs WHERE id = ?', job_id)
+        return bool(rows and rows[0]['cancel'])
+
+    def active(self) -> List[Dict]:
+        return [dict(row) for row in self._execute(
+            'SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created',
+            *JOB_ACTIVE
+        )]
+
+    def resumable(self) -> List[Dict]:
+        """ the queued jobs, and the running jobs whose lease has expired """
+        return [dict(row) for row in self._execute(
+            'SELECT * FROM jobs WHERE status = ? OR '
+            '(status = ? AND (lease IS NULL OR lease < ?)) ORDER BY created',
+            JOB_QUEUED, JOB_RUNNING, time()
+        )]
+
+    def changed_since(self, since: float) -> List[Dict]:
+        return [dict(row) for row in self._execute(
+            'SELECT * FROM jobs WHERE updated > ? AND surface IS NOT NULL',
+            since
+        )]
+
+
+class JobContext(object):
+    """
+    The JobContext is given to the job function so that it can report
+    progress and determine if the job was cancelled.  The context only uses
+    the job store, so it is usable in a worker process.
+    """
+
+    CANCEL_CHECK_INTERVAL = 0.5
+
+    def __init__(self, store: JobStore, job_id: str, params: Dict):
+        self.store = store
+        self.job_id = job_id
+        self.params = params
+        self._cancelled = False
+        self._cancel_checked = 0.0
+
+    def progress(self, text: str) -> None:
+        """ record the job progress; this is reflected into the job surface """
+        self.store.update(self.job_id, progress=text)
+
+    @property
+    def cancelled(self) -> bool:
+        now = monotonic()
+        if not self._cancelled and now - self._cancel_checked >= self.CANCEL_CHECK_INTERVAL:
+            self._cancel_checked = now
+            self._cancelled = self.store.is_cancelled(self.job_id)
+
+        return self._cancelled
+
+    def check_cancelled(self) -> None:
+        """ raise JobCancelled if the job was cancelled """
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+
+def _run_job(
+    store_path: str,
+    job_id: str,
+    func: Callable,
+    params: Dict,
+    owner: str,
+    lease_ttl: float
+):
+    """
+    Execute the job function; this is the worker entrypoint for both the
+    thread pool and the process pool.  The job is not run if it was claimed
+    by another job manager.
+    """
+    store = JobStore(store_path)
+
+    if not store.claim(job_id, owner, lease_ttl):
+        return
+
+    ctx = JobContext(store, job_id, params)
+
+    if ctx.cancelled:
+        store.update(job_id, status=JOB_CANCELLED)
+        return
+
+    try:
+        result = func(ctx, **params)
+
+    except JobCancelled:
+        store.update(job_id, status=JOB_CANCELLED)
+
+    except Exception as exc:
+        store.update(job_id, status=JOB_FAILED, error=f'{type(exc).__name__}: {exc}')
+
+    else:
+        status = JOB_CANCELLED if ctx.cancelled else JOB_DONE
+        store.update(job_id, status=status, result=json.dumps(result, default=str))
+
+
+class JobManager(object):
+
+    def __init__(
+        self,
+        app,        # SlackApp
+        path: str,
+        processes: Optional[bool] = False,
+        max_workers: Optional[int] = 4,
+        update_interval: Optional[float] = 2.0,
+        lease_ttl: Optional[float] = 30.0
+    ):
+        """
+        Creates the job subsystem of the app, assigned as `app.jobs`.
+
+        Parameters
+        ----------
+        app: SlackApp
+            The app context
+
+        path: str
+            The SQLite database file of the durable job queue.
+
+        processes: bool
+            When True, jobs are run in a process pool; the job functions and
+            parameters must then be picklable, i.e. module level functions.
+            When False, jobs are run in a thread pool.
+
+        max_workers: int
+            The maximum number of jobs run at the same time.
+
+        update_interval: float
+            The number of seconds between job surface updates; progress
+            recorded within the interval is coalesced into one update.
+
+        lease_ttl: float
+            The number of seconds a running job stays claimed by this manager
+            without a renewal; the leases are renewed every update_interval.
+            A running job whose lease expired, because its app process
+            stopped, is resumed by the next job manager started.
+        """
+        if lease_ttl <= update_interval:
+            raise SlackAppTKError('Job lease_ttl must be greater than update_interval')
+
+        self.app = app
+        self.store = JobStore(path)
+        self.processes = processes
+        self.max_workers = max_workers
+        self.update_interval = update_interval
+        self.lease_ttl = lease_ttl
+        self.owner = uuid4().hex
+
+        self._funcs: Dict[str, Callable] = dict()
+        self._executor = None
+        self._monitor = None
+        self._stopping = Event()
+        self._last_poll = 0.0
+
+        app.jobs = self
+        app.ic.block_action.on(JOB_CANCEL_BLOCK_ID, self._on_cancel)
+
+    # -------------------------------------------------------------------------
+    # Public methods
+    # -------------------------------------------------------------------------
+
+    def register(self, name: Optional[str] = None) -> Callable:
+        """
+        Decorator used to register a job function.  The function is called as
+        func(ctx: JobContext, **params).  Jobs are stored by name so that they
+        can be resumed after a restart.
+        """
+        def decorator(func):
+            self._funcs[name or func.__qualname__] = func
+            return func
+
+        return decorator
+
+    def start(self) -> None:
+        """
+        Start the job workers and the surface monitor.  Queued jobs, and
+        running jobs whose lease has expired, are resumed; each is run only if
+        this manager claims it.
+        """
+        if self._executor:
+            return
+
+        pool_cls = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        self._executor = pool_cls(max_workers=self.max_workers)
+        self._stopping.clear()
+
+        # the monitor updates the surfaces of the jobs changed from now on;
+        # the surfaces of the resumed jobs are refreshed once when it starts,
+        # rather than those of every job that ever had a surface.
+
+        self._last_poll = time()
+        resumable = self.store.resumable()
+
+        for job in resumable:
+            self._dispatch(job['id'], job['name'], json.loads(job['params']))
+
+        resumed = [job for job in resumable if job['surface']]
+        self._monitor = Thread(target=self._monitor_surfaces, args=(resumed,), daemon=True)
+        self._monitor.start()
+
+    def stop(self, wait: Optional[bool] = True) -> None:
+        # the monitor is stopped last so that the job leases are renewed
+        # while the running jobs complete.
+
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+        self._stopping.set()
+
+    def submit(
+        self,
+        name: str,
+        params: Optional[Dict] = None,
+        surface: Optional[Union[Messenger, Any]] = None
+    ) -> str:
+        """
+        Queue a job.
+
+        Parameters
+        ----------
+        name: str
+            The registered job name
+
+        params: dict
+            The JSON serializable job function keyword arguments.
+
+        surface: Messenger | Modal
+            If provided, the job progress is reflected into this surface.  For
+            a Messenger a new message is sent; for a Modal the modal view
+            is updated.  The surface includes a button to cancel the job.
+
+        Returns
+        -------
+        str
+            The job ID
+        """
+        if name not in self._funcs:
+            raise SlackAppTKError(f'Unknown job name: {name}')
+
+        if not self._executor:
+            self.start()
+
+        job_id = uuid4().hex
+        params = params or {}
+
+        self.store.add(job_id, name, params, surface=None)
+        job_surface = self._open_surface(job_id, name, surface) if surface is not None else None
+        if job_surface:
+            self.store.update(job_id, surface=json.dumps(job_surface))
+
+        self._dispatch(job_id, name, params)
+        return job_id
+
+    def cancel(self, job_id: str) -> None:
+        self.store.request_cancel(job_id)
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    # -------------------------------------------------------------------------
+    # Private methods
+    # -------------------------------------------------------------------------
+
+    def _dispatch(self, job_id: str, name: str, params: Dict):
+        func = self._funcs.get(name)
+        if not func:
+            self.app.log.error(f'Unknown job name: {name}, job {job_id} failed')
+            self.store.update(job_id, status=JOB_FAILED, error=f'Unknown job name: {name}')
+            return
+
+        self._executor.submit(
+            _run_job, self.store.path, job_id, func, params,
+            self.owner, self.lease_ttl
+        )
+
+    def _on_cancel(self, rqst, action):
+        self.cancel(action.value)
+
+    @staticmethod
+    def _render_blocks(job: Dict) -> List[Dict]:
+        status = job['status']
+        text = f"*{job['name']}* - {status}"
+
+        if status == JOB_DONE and job['result'] not in (None, 'null'):
+            text += f"\n{json.loads(job['result'])}"
+        elif status == JOB_FAILED:
+            text += f"\n```{job['error']}```"
+        elif job['progress']:
+            text += f"\n{job['progress']}"
+
+        blocks = [SectionBlock(text=text).to_dict()]
+
+        if status in JOB_ACTIVE:
+            blocks.append(ActionsBlock(
+                block_id=JOB_CANCEL_BLOCK_ID,
+                elements=[ButtonElement(
+                    text='Cancel', action_id=JOB_CANCEL_BLOCK_ID,
+                    value=job['id'], style='danger'
+                )]
+            ).to_dict())
+
+        return blocks
+
+    def _open_surface(self, job_id: str, name: str, surface) -> Optional[Dict]:
+        job = self.store.get(job_id)
+        blocks = self._render_blocks(job)
+
+        if isinstance(surface, Messenger):
+            res = surface.send(text=f'{name} - {JOB_QUEUED}', blocks=blocks)
+            return {
+                'type': 'message',
+                'channel': res['channel'],
+                'ts': res['ts']
+            }
+
+        view = getattr(surface, 'view', None)
+        if getattr(view, 'view_id', None):
+            return {
+                'type': 'view',
+                'view_id': view.view_id,
+                'title': view.title.text if view.title else name,
+                'callback_id': view.callback_id
+            }
+
+        self.app.log.error(f'Unsupported job surface: {type(surface)}')
+        return None
+
+    def _update_surface(self, client: WebClient, job: Dict):
+        surface = json.loads(job['surface'])
+        blocks = self._render_blocks(job)
+
+        if surface['type'] == 'message':
+            client.chat_update(
+                channel=surface['channel'],
+                ts=surface['ts'],
+                text=f"{job['name']} - {job['status']}",
+                blocks=blocks
+            )
+            return
+
+        view = View(
+            type='modal',
+            title=PlainTextObject(text=surface['title']),
+            callback_id=surface['callback_id'],
+            blocks=blocks
+        )
+
+        self.app.view_updater.update(
+            client=client,
+            view_id=surface['view_id'],
+            view=view.to_dict()
+        )
+
+    def _update_surfaces(self, client: WebClient, jobs: List[Dict]):
+        for job in jobs:
+            try:
+                self._update_surface(client, job)
+
+            except Exception as exc:
+                self.app.log.error(f"Unable to update job {job['id']} surface: {exc}")
+
+    def _monitor_surfaces(self, resumed: List[Dict]):
+        client = WebClient(token=self.app.config.token)
+        self._update_surfaces(client, resumed)
+
+        while not self._stopping.wait(self.update_interval):
+            try:
+                self.store.renew(self.owner, self.lease_ttl)
+
+            except sqlite3.Error as exc:
+                self.app.log.error(f'Unable to renew job leases: {exc}')
+
+            since, self._last_poll = self._last_poll, time()
+            self._update_surfaces(client, self.store.changed_since(since))
@@ -12,15 +12,24 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
-import asyncio
 from collections import UserDict
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Optional, Callable, Iterable, Union, Dict, List, NamedTuple
 
 from slack.errors import SlackApiError
 from slack.web.client import WebClient
-from slack.web.async_internal_utils import _get_event_loop
+from slack.web.classes import extract_json
 
-__all__ = ["Messenger"]
+from slackapptk.errors import SlackAppTKError
+from slackapptk.utils.ratelimit import RateBucket
+from slackapptk.web.classes.builder import BlockBuilder, MAX_MESSAGE_BLOCKS
+
+__all__ = ["Messenger", "SendManyResults"]
+
+
+class SendManyResults(NamedTuple):
+    results: Dict[int, Any]
+    failures: Dict[int, Exception]
 
 
 class Messenger(UserDict):
@@ -66,7 +75,6 @@ class Messenger(UserDict):
 
         self.client = WebClient(self.app.config.token)
 
-    # noinspection PyProtectedMember
     def send_response(
         self,
         response_url: Optional[str] = None,
@@ -97,8 +105,8 @@ class Messenger(UserDict):
 
         Notes
         -----
-        Ideally this method should be a part of the `slackclient` BaseClient class to avoid
-        using the internals of the client instance.  TODO: open issue with that repo.
+        The message is sent using the app synchronous transport, so that
+        threads can send concurrently without an asyncio event loop.
         """
         req_args = dict(
             # contents of messenger[UserDict]
@@ -107,22 +115,9 @@ class Messenger(UserDict):
             **kwargs
         )
 
-        if self.client._event_loop is None:
-            self.client._event_loop = _get_event_loop()
-
         api_url = response_url or self.response_url
-
-        future = asyncio.ensure_future(
-            self.client._request(
-                http_verb='POST',
-                api_url=api_url,
-                req_args=dict(json=req_args)
-            ),
-            loop=_get_event_loop()
-        )
-
-        res = self.client._event_loop.run_until_complete(future)
-        status = res['status_code']
+        res = self.app.transport.post_json(api_url, req_args)
+        status = res.status_code
 
         if status != 200:
             raise SlackApiError(
@@ -148,7 +143,18 @@ class Messenger(UserDict):
         ----------------
         user: str
             send a private message (via postEphemeral) to user
+
+        Raises
+        ------
+        SlackAppTKError
+            When the message contains more blocks than Slack permits; use
+            send_blocks() to split the blocks across threaded messages.
         """
+        blocks = kwargs.get('blocks', self.get('blocks'))
+        if blocks and len(blocks) > MAX_MESSAGE_BLOCKS:
+            raise SlackAppTKError(
+                f'message has {len(blocks)} blocks, exceeds limit of {MAX_MESSAGE_BLOCKS}'
+            )
 
         if 'user' in kwargs:
             api_call = self.client.chat_postEphemeral
@@ -163,3 +169,168 @@ class Messenger(UserDict):
             # any other API fields provided by Caller
             **kwargs
         )
+
+    def send_blocks(
+        self,
+        blocks: Iterable,
+        channel: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs
+    ) -> List:
+        """
+        Send an arbitrary number of blocks to the User.  The blocks are
+        validated and split into messages within the Slack block limit before
+        any message is sent.  The first message is sent as-is, and the
+        remaining messages are sent as threaded replies to the first.
+
+        Parameters
+        ----------
+        blocks: Iterable[Block|dict]
+            The blocks to send.
+
+        channel: str
+           Direct the message to channel, rather than original channel value
+           from instance initialization.
+
+        max_bytes: int
+            Optional maximum JSON size of the blocks in each message.
+
+        Other Parameters
+        ----------------
+        Any other kwargs are passed as content into each message.
+
+        Returns
+        -------
+        List
+            The API response of each message sent.
+        """
+        pages = list(BlockBuilder(max_bytes=max_bytes).extend(blocks))
+        if not pages:
+            return []
+
+        res_list = [self.send(channel=channel, blocks=pages[0], **kwargs)]
+        first_res = res_list[0]
+
+        # if this messenger is not already threaded, then thread the
+        # remaining messages as replies to the first.
+
+        if 'thread_ts' not in self:
+            kwargs['thread_ts'] = first_res.get('ts') or first_res.get('message_ts')
+
+        channel = first_res.get('channel') or channel
+
+        for page in pages[1:]:
+            res_list.append(self.send(channel=channel, blocks=page, **kwargs))
+
+        return res_list
+
+    def send_many(
+        self,
+        targets: Iterable[Union[str, Dict]],
+        progress: Optional[Callable] = None,
+        max_workers: Optional[int] = 8,
+        rate: Optional[float] = 20.0,
+        retries: Optional[int] = 1,
+        **kwargs
+    ) -> SendManyResults:
+        """
+        Send the same message to many channels or users.  The message payload
+        is rendered once and the API calls are dispatched concurrently, paced
+        by a shared rate-limit bucket.
+
+        Parameters
+        ----------
+        targets: Iterable[str|dict]
+            Each item is either a channel value, or a dict of per-target API
+            fields, for example {'channel': 'C123', 'user': 'U123'} to send
+            a private message (via postEphemeral) to the user.
+
+        progress: Callable
+            If provided, called as progress(target, result, done, total) as
+            each target completes, where result is either the API response
+            or the exception raised for that target.
+
+        max_workers: int
+            The maximum number of concurrent API calls.
+
+        rate: float
+            The maximum number of API calls per second across all workers.
+
+        retries: int
+            The number of times to retry a target when api.slack.com
+            responds "ratelimited"; the Retry-After value is honored.
+
+        Other Parameters
+        ----------------
+        Any other kwargs are passed as content into the message.
+
+        Returns
+        -------
+        SendManyResults
+            results - dict of target index to the API response
+            failures - dict of target index to the exception raised
+
+            The target index is the position of the target in targets, so
+            that a target given more than once has a result for each.
+        """
+        payload = dict(
+            # contents of messenger[UserDict]
+            **self,
+            # any other API fields provided by Caller
+            **kwargs
+        )
+
+        # the blocks and attachments are validated and serialized once, rather
+        # than by each API call.
+
+        for field in ('blocks', 'attachments'):
+            if payload.get(field):
+                payload[field] = extract_json(payload[field])
+
+        targets = [
+            {'channel': each} if isinstance(each, str) else each
+            for each in targets
+        ]
+
+        total = len(targets)
+        bucket = RateBucket(rate=rate)
+        results, failures = dict(), dict()
+
+        def send_one(target):
+            api_args = dict(payload, **target)
+            api_args.setdefault('channel', self.channel)
+
+            api_call = (self.client.chat_postEphemeral if 'user' in api_args
+                        else self.client.chat_postMessage)
+
+            for attempt in range(retries + 1):
+                bucket.acquire()
+                try:
+                    return api_call(**api_args)
+
+                except SlackApiError as exc:
+                    if exc.response.get('error') != 'ratelimited' or attempt == retries:
+                        raise
+
+                    bucket.pause(float(exc.response.headers.get('Retry-After', 1)))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(send_one, target): index
+                for index, target in enumerate(targets)
+            }
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                target = targets[index]
+
+                try:
+                    res = results[index] = future.result()
+
+                except Exception as exc:
+                    res = failures[index] = exc
+
+                if progress:
+                    progress(target, res, done, total)
+
+        return SendManyResults(results=results, failures=failures)
@@ -1,23 +1,59 @@
-from typing import Callable, Optional
+from typing import Callable, Optional, Iterable, Dict
 from enum import IntEnum, auto
+from collections import OrderedDict
+from threading import Lock
+import secrets
 
 from slack.web.classes.objects import PlainTextObject
+from slack.web.classes.blocks import ActionsBlock
+from slack.web.classes.elements import ButtonElement
+
 from slackapptk.request.any import AnyRequest
 from slackapptk.web.classes.view import View
+from slackapptk.web.classes.builder import BlockBuilder, MAX_VIEW_BLOCKS
 from slackapptk.errors import SlackAppTKError
 from slackapptk.app import SlackApp
+from slackapptk.form import Form
 
 __all__ = [
     'Modal', 'MODAL_MODE',
-    'View'
+    'View', 'Form'
 ]
 
 
+def share_callback(app, kind, event, callback):
+    # register the callback in the app shared registry, if configured, so that
+    # other app processes can handle the view events.
+
+    if not app.shared_registry:
+        return
+
+    # a form binding is local to this process, so another process resolving
+    # the callback would skip the form validation; the callback is not shared.
+
+    if kind == 'view' and event in app.forms:
+        app.shared_registry.unregister(kind, event)
+        app.log.warning(f'Callback for {kind} {event} is not shared: a form is bound')
+        return
+
+    try:
+        app.shared_registry.register(kind, event, callback)
+
+    except SlackAppTKError as exc:
+        app.log.warning(f'Callback for {kind} {event} is not shared: {exc}')
+
+
 def with_callback(meth):
     def wrapper(self, *args, callback: Callable = None, **kwargs):
+        self.save_state()
+
+        if self.form:
+            self.form.bind(self.app, self.view.callback_id)
+
         cbk = callback or self.callback
         if cbk:
             self.app.ic.view.on(self.view.callback_id, cbk)
+            share_callback(self.app, 'view', self.view.callback_id, cbk)
 
         if self.notify_on_close:
             self.view.notify_on_close = True
@@ -25,6 +61,8 @@ def with_callback(meth):
                 self.view.callback_id,
                 self.notify_on_close
             )
+            share_callback(self.app, 'view_closed', self.view.callback_id,
+                           self.notify_on_close)
 
         return meth(self, *args, **kwargs)
 
@@ -43,7 +81,8 @@ class Modal(object):
         rqst: AnyRequest,
         view: Optional[View] = None,
         detached: Optional[bool] = False,
-        callback: Optional[Callable] = None
+        callback: Optional[Callable] = None,
+        form: Optional[Form] = None
     ):
         """
 
@@ -64,6 +103,14 @@ class Modal(object):
             general process, for example running in a backthrough Thread,
             then set this to True so that the methods operating on the
             modal, for example update(), execute as required.
+
+        callback : Callable
+            The handler invoked upon view submission.
+
+        form : Form
+            If provided, the form input blocks are added to a new view, and
+            upon view submission the input values are validated by the form
+            before the callback is invoked.
         """
         self.rqst = rqst
         self.app: SlackApp = rqst.app
@@ -81,7 +128,61 @@ class Modal(object):
         self.view = view or from_payload_or_new()
         self.detached = detached
         self.callback = callback
+        self.form = form
+
+        if form and not self.view.blocks:
+            form.render(self.view)
         self.notify_on_close = None
+        self._state = None
+        self._state_token = None
+
+    @property
+    def state(self) -> Dict:
+        """
+        The modal state dict.  If the app view_state store is configured, the
+        state is kept by the store and the view private_metadata carries only
+        the store token; the state is loaded on first access and saved when
+        the view is opened, updated, or pushed; a private_metadata dict set
+        before the store token is assigned becomes the initial state.
+        Otherwise the state is the view private_metadata dict.
+        """
+        if self._state is not None:
+            return self._state
+
+        store = self.app.view_state
+        metadata = self.view.private_metadata
+
+        if store is None:
+            if not isinstance(metadata, dict):
+                metadata = self.view.private_metadata = dict()
+
+            self._state = metadata
+            return self._state
+
+        token = store.token_of(metadata)
+        if token is None:
+            token = store.new_token()
+            self.view.private_metadata = store.to_metadata(token)
+            state = dict(metadata) if isinstance(metadata, dict) else dict()
+
+        else:
+            state = store.get(token)
+
+        self._state_token = token
+        self._state = state
+        return self._state
+
+    def save_state(self) -> None:
+        """
+        Save the modal state in the app view_state store, if used; otherwise
+        set the state as the view private_metadata, since the view is
+        serialized with the private_metadata as a JSON string.
+        """
+        if self._state_token is not None:
+            self.app.view_state.set(self._state_token, self._state)
+
+        elif self._state is not None:
+            self.view.private_metadata = self._state
 
     @with_callback
     def open(self):
@@ -90,24 +191,36 @@ class Modal(object):
             view=self.view.to_dict())
 
     @with_callback
-    def update(self):
+    def update(self, force: Optional[bool] = False):
+        """
+        Update the modal view.  If the rendered view is identical to the last
+        one sent for the view_id, then views.update is not called unless force
+        is True.
+        """
         if self.rqst.rqst_type == 'view_submission' and not self.detached:
+            # the view is replaced by the response, not by the view updater,
+            # so its last render digest no longer holds.
+
+            if getattr(self.view, 'view_id', None):
+                self.app.view_updater.forget(self.view.view_id)
+
             return {
                 'response_action': 'update',
                 'view': self.view.to_dict()
             }
 
+        # updates to the same view_id are serialized and coalesced by the app
+        # view updater, which also tracks the newest view hash.
+
         if hasattr(self.view, 'view_id'):
-            kwargs = dict(
+            return self.app.view_updater.update(
+                client=self.rqst.client,
+                view_id=self.view.view_id,
                 view=self.view.to_dict(),
-                view_id=self.view.view_id
+                view_hash=None if self.detached else self.view.view_hash,
+                force=force
             )
 
-            if not self.detached:
-                kwargs['hash'] = self.view.view_hash
-
-            return self.rqst.client.views_update(**kwargs)
-
         raise SlackAppTKError(
             f'Attempting to update view in unknown context'
         )
@@ -124,3 +237,151 @@ class Modal(object):
             trigger_id=self.rqst.trigger_id,
             view=self.view.to_dict()
         )
+
+    def paginate(
+        self,
+        blocks: Iterable,
+        max_bytes: Optional[int] = None
+    ) -> int:
+        """
+        Split the given blocks into pages that fit within the Slack view
+        limits, and set this modal view to the first page.  When there is more
+        than one page, a navigation block with Prev/Next buttons is appended
+        to each page and the handler to change pages is bound to the app.
+        The blocks are validated before any page is sent.
+
+        Parameters
+        ----------
+        blocks: Iterable[Block|dict]
+            The blocks to display in the modal view.
+
+        max_bytes: int
+            Optional maximum JSON size of the blocks in each page.
+
+        Returns
+        -------
+        int
+            The number of pages.
+        """
+
+        # reserve one block in each page for the navigation block.
+
+        pages = list(BlockBuilder(
+            max_blocks=MAX_VIEW_BLOCKS - 1,
+            max_bytes=max_bytes
+        ).extend(blocks)) or [[]]
+
+        if len(pages) == 1:
+            self.view.blocks = pages[0]
+            return 1
+
+        # the pages are stored per paginate() call, and the navigation buttons
+        # carry the pages token, so that modals sharing a callback_id each
+        # page through their own blocks.
+
+        token = secrets.token_urlsafe(8)
+        _store_pages(self.app, token, pages)
+
+        # the pages are discarded by the app when the modal is closed
+        self.view.notify_on_close = True
+
+        nav_id = f'{self.view.callback_id}.pages'
+        block_action = self.app.ic.block_action
+        if _on_page not in block_action.listeners(nav_id):
+            block_action.remove_all_listeners(nav_id)
+            block_action.on(nav_id, _on_page)
+            share_callback(self.app, 'block_action', nav_id, _on_page)
+
+        self.view.blocks = _page_blocks(nav_id, token, pages, 0)
+        return len(pages)
+
+
+# -----------------------------------------------------------------------------
+# Modal pagination
+# -----------------------------------------------------------------------------
+
+# the pages of the paginated modals, by token; the app view_state store is
+# used if configured, so that any app process can change pages.
+
+MAX_PAGED_VIEWS = 256
+
+_paged_views = OrderedDict()
+_paged_views_lock = Lock()
+
+
+def _store_pages(app, token, pages):
+    if app.view_state is not None:
+        app.view_state.set('pages.' + token, {'pages': pages})
+        return
+
+    with _paged_views_lock:
+        _paged_views[token] = pages
+        while len(_paged_views) > MAX_PAGED_VIEWS:
+            _paged_views.popitem(last=False)
+
+
+def _load_pages(app, token):
+    if app.view_state is not None:
+        return app.view_state.get('pages.' + token).get('pages')
+
+    with _paged_views_lock:
+        pages = _paged_views.get(token)
+        if pages is not None:
+            _paged_views.move_to_end(token)
+        return pages
+
+
+def discard_pages(app, view: Dict) -> None:
+    """
+    Discard the stored pages of the paginated modal, given the view payload of
+    its view_closed request; the pages token is carried by the navigation
+    block buttons.
+    """
+    for block in view.get('blocks') or ():
+        if block.get('type') != 'actions' or not block.get('block_id', '').endswith('.pages'):
+            continue
+
+        for element in block.get('elements') or ():
+            token = (element.get('value') or '').rpartition(':')[0]
+            if token:
+                _discard_pages(app, token)
+                return
+
+
+def _discard_pages(app, token):
+    if app.view_state is not None:
+        app.view_state.discard('pages.' + token)
+        return
+
+    with _paged_views_lock:
+        _paged_views.pop(token, None)
+
+
+def _page_blocks(nav_id, token, pages, page_no):
+    page = list(pages[page_no])
+
+    buttons = list()
+    if page_no > 0:
+        buttons.append(ButtonElement(
+            text='Prev', action_id=nav_id + '.prev', value=f'{token}:{page_no - 1}'
+        ))
+
+    if page_no < len(pages) - 1:
+        buttons.append(ButtonElement(
+            text='Next', action_id=nav_id + '.next', value=f'{token}:{page_no + 1}'
+        ))
+
+    page.append(ActionsBlock(block_id=nav_id, elements=buttons).to_dict())
+    return page
+
+
+def _on_page(rqst, action):
+    token, _, page_no = action.value.rpartition(':')
+    pages = _load_pages(rqst.app, token)
+    if not pages:
+        rqst.app.log.warning(f'Modal pages expired: {rqst.view.callback_id}')
+        return
+
+    modal = Modal(rqst)
+    modal.view.blocks = _page_blocks(action.data['block_id'], token, pages, int(page_no))
+    return modal.update()
@@ -0,0 +1,265 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the OptionSource, used to declare the options of a select
+menu once.  When the options fit within the Slack static select limit, the
+select is rendered as a static_select with the options inline, so that no
+request is made to the app as the User types.  Otherwise the select is
+rendered as an external_select, and the app handles the option requests with
+a per-User cache of the last query results.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Callable, Iterable, List, Dict, Union
+from threading import Lock
+from time import monotonic, sleep
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.web.classes.objects import Option
+from slack.web.classes.elements import (
+    StaticSelectElement, ExternalDataSelectElement
+)
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.errors import SlackAppTKError
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'OptionSource',
+    'MAX_STATIC_OPTIONS'
+]
+
+# https://api.slack.com/reference/block-kit/block-elements#static_select
+
+MAX_STATIC_OPTIONS = 100
+
+
+def _as_option(option: Union[Option, str]) -> Option:
+    if isinstance(option, Option):
+        return option
+
+    return Option(value=option, label=option)
+
+
+def _option_label(option: Option) -> str:
+    return (option.label or option.value or '').lower()
+
+
+class _UserQuery(object):
+    """ the last query results of a User """
+
+    __slots__ = ('seq', 'query', 'options', 'complete', 'expires')
+
+    def __init__(self):
+        self.seq = 0
+        self.query = None
+        self.options: List[Option] = list()
+        self.complete = False
+        self.expires = 0.0
+
+
+class OptionSource(object):
+    """
+    The OptionSource declares the options of a select menu; either a static
+    set of options, or a loader function that returns the options matching
+    the User query.  For example:
+
+        devices = OptionSource(app, block_id='device', options=device_names)
+
+        InputBlock(
+            block_id='device', label='Device',
+            element=devices.element(action_id='device')
+        )
+
+    The select menu must be placed in a block with the OptionSource
+    block_id, since the option requests are routed by block_id.
+    """
+
+    def __init__(
+        self,
+        app,
+        block_id: str,
+        options: Optional[Iterable[Union[Option, str]]] = None,
+        loader: Optional[Callable] = None,
+        min_query_length: Optional[int] = 1,
+        cache_ttl: Optional[float] = 10.0,
+        debounce: Optional[float] = 0.2
+    ):
+        """
+        Parameters
+        ----------
+        app: SlackApp
+            The app that handles the option requests
+
+        block_id: str
+            The block_id of the block containing the select menu
+
+        options: Iterable[Option|str]
+            The static set of options
+
+        loader: Callable
+            Called as loader(rqst, query) to return the list of options for
+            the User query; used for dynamic option sets.
+
+        min_query_length: int
+            The number of characters the User types before the options are
+            requested; for external selects only.
+
+        cache_ttl: float
+            The number of seconds the last query results of a User are kept.
+            A query that extends the last query is filtered from those results
+            when the results were complete.
+
+        debounce: float
+            The number of seconds to wait before calling the loader; if the
+            User types again in the meantime, the loader is not called for
+            the superseded query.
+        """
+        if options is None and loader is None:
+            raise SlackAppTKError(f'OptionSource {block_id}: options or loader required')
+
+        self.app = app
+        self.block_id = block_id
+        self.options = [_as_option(option) for option in options] if options is not None else None
+        self.loader = loader
+        self.min_query_length = min_query_length
+        self.cache_ttl = cache_ttl
+        self.debounce = debounce
+        self._queries: Dict[str, _UserQuery] = dict()
+        self._lock = Lock()
+
+        if self.is_external:
+            self.app.ic.select.on(block_id, self.on_select)
+
+    @property
+    def is_external(self) -> bool:
+        """ True if the select is rendered as an external_select """
+        return self.loader is not None or len(self.options) > MAX_STATIC_OPTIONS
+
+    def element(
+        self,
+        action_id: Optional[str] = None,
+        placeholder: Optional[str] = 'Select',
+        initial_option: Optional[Union[Option, str]] = None,
+        **kwargs
+    ) -> Union[StaticSelectElement, ExternalDataSelectElement]:
+        """
+        Return the select menu element; a static_select with the options
+        inline if the options fit within the Slack limit, or otherwise an
+        external_select.
+        """
+        if initial_option is not None:
+            kwargs['initial_option'] = _as_option(initial_option)
+
+        if not self.is_external:
+            return StaticSelectElement(
+                action_id=action_id or self.block_id,
+                placeholder=placeholder,
+                options=self.options,
+                **kwargs
+            )
+
+        return ExternalDataSelectElement(
+            action_id=action_id or self.block_id,
+            placeholder=placeholder,
+            min_query_length=self.min_query_length,
+            **kwargs
+        )
+
+    # -------------------------------------------------------------------------
+    # option requests
+    # -------------------------------------------------------------------------
+
+    def on_select(self, rqst, action) -> List[Option]:
+        """ the app select handler; returns the options for the User query """
+        query = (action.value or '').lower()
+        now = monotonic()
+
+        with self._lock:
+            user = self._queries.get(rqst.user_id)
+            if user is None:
+                user = self._queries[rqst.user_id] = _UserQuery()
+
+            user.seq += 1
+            seq = user.seq
+
+            cached = self._cached(user, query, now)
+            if cached is not None:
+                return cached
+
+        if self.loader is None:
+            options, complete = self._filter(self.options, query), True
+
+        else:
+            if self.debounce:
+                sleep(self.debounce)
+
+                # a newer query from the User supersedes this one; answer from
+                # the last results rather than calling the loader.
+
+                with self._lock:
+                    if user.seq != seq:
+                        return self._filter(user.options, query)[:MAX_STATIC_OPTIONS]
+
+            options = [_as_option(option) for option in self.loader(rqst, action.value) or []]
+            complete = len(options) < MAX_STATIC_OPTIONS
+
+        with self._lock:
+            user.query, user.options, user.complete = query, options, complete
+            user.expires = monotonic() + self.cache_ttl
+            self._purge(now)
+
+        return options[:MAX_STATIC_OPTIONS]
+
+    def _cached(self, user: _UserQuery, query: str, now: float) -> Optional[List[Option]]:
+        if user.query is None or user.expires <= now:
+            return None
+
+        if query == user.query:
+            return user.options[:MAX_STATIC_OPTIONS]
+
+        # a query that extends the last query matches a subset of the last
+        # results, if those were not truncated.
+
+        if user.complete and query.startswith(user.query):
+            return self._filter(user.options, query)[:MAX_STATIC_OPTIONS]
+
+        return None
+
+    @staticmethod
+    def _filter(options: List[Option], query: str) -> List[Option]:
+        if not query:
+            return list(options)
+
+        return [option for option in options if query in _option_label(option)]
+
+    def _purge(self, now: float):
+        expired = [user_id for user_id, user in self._queries.items() if user.expires <= now]
+        for user_id in expired:
+            del self._queries[user_id]
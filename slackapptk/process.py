@@ -0,0 +1,201 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the process-pool execution mode for CPU-heavy slash
+command handlers.  The request is shipped to a worker process as a compact,
+picklable snapshot; the worker rebuilds the request, and therefore any
+Response/Messenger, and the handler results are routed back to the User via
+the request response_url.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Callable, Dict, NamedTuple
+from argparse import Namespace
+from functools import wraps, partial
+from importlib import import_module
+from inspect import signature
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.cli import NS_ATTR_RESP
+from slackapptk.response import Response
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'run_in_process',
+    'RequestSnapshot'
+]
+
+
+class RequestSnapshot(NamedTuple):
+    rqst_type: str
+    rqst_data: Dict
+    channel: Optional[str]
+    config: Dict
+
+    @classmethod
+    def from_request(cls, rqst) -> 'RequestSnapshot':
+        app_config = rqst.app.config
+        return cls(
+            rqst_type=rqst.rqst_type,
+            rqst_data=dict(rqst.rqst_data),
+            channel=rqst.channel,
+            config=dict(
+                app_config,
+                token=app_config.token,
+                signing_secret=app_config.signing_secret
+            )
+        )
+
+    def to_request(self):
+        """ rebuild the request, and the app it is bound to, in the worker process """
+        from slackapptk.app import SlackApp
+        from slackapptk.request.all import CommandRequest, EventRequest
+        from slackapptk.request.interactive import InteractiveRequest
+
+        app = _worker_apps.get(self.config['token'])
+        if not app:
+            app = _worker_apps[self.config['token']] = SlackApp()
+            app.config.from_obj(self.config)
+
+        if self.rqst_type == 'command':
+            rqst = CommandRequest(app=app, form_data=self.rqst_data)
+        elif self.rqst_type == 'event':
+            rqst = EventRequest(app=app, body=self.rqst_data)
+        else:
+            rqst = InteractiveRequest(app=app, payload=self.rqst_data)
+
+        rqst.channel = self.channel
+        return rqst
+
+
+# the apps rebuilt in a worker process, keyed by token
+
+_worker_apps = dict()
+
+
+def _resolve_handler(handler_path: str) -> Callable:
+    module_name, _, qualname = handler_path.partition(':')
+    handler = import_module(module_name)
+    for name in qualname.split('.'):
+        handler = getattr(handler, name)
+
+    # the module attribute is the run_in_process wrapper; obtain the original
+    # handler function.
+
+    return getattr(handler, '__wrapped__', handler)
+
+
+def _run_handler(
+    handler_path: str,
+    snapshot: RequestSnapshot,
+    ns_args: Optional[Dict]
+):
+    """ the worker process entrypoint """
+    handler = _resolve_handler(handler_path)
+    rqst = snapshot.to_request()
+
+    if ns_args is None:
+        return handler(rqst)
+
+    ns = Namespace(**ns_args)
+    setattr(ns, NS_ATTR_RESP, rqst)
+    return handler(rqst, ns)
+
+
+def _route_result(rqst, future) -> None:
+    """ send the handler result, or failure, back to the User """
+    try:
+        result = future.result()
+
+    except Exception as exc:
+        rqst.app.log.error(f'Process handler failed: {type(exc).__name__}: {exc}')
+        Response(rqst).send_response(text=f'Your command failed: `{exc}`')
+        return
+
+    if not result:
+        return
+
+    if isinstance(result, dict):
+        Response(rqst).send_response(**result)
+    else:
+        Response(rqst).send_response(text=str(result))
+
+
+def run_in_process(
+    func: Optional[Callable] = None,
+    *,
+    ack: Optional[str] = None
+) -> Callable:
+    """
+    Decorator used to run a slash command handler in the app process pool,
+    for example:
+
+        @slash_report.cli.on(cmd.prog)
+        @run_in_process(ack='Generating the report ...')
+        def report(rqst, cliargs):
+            ...
+
+    The handler must be a module level function, and the command arguments
+    must be picklable.  Within the worker process the handler is given a
+    rebuilt request, so it may create a Response as usual.  The value returned
+    by the handler, a str or a dict of message fields, is sent to the User via
+    the request response_url.
+
+    Parameters
+    ----------
+    func: Callable
+        The handler function
+
+    ack: str
+        If provided, the immediate response to the slash command; otherwise
+        the command is acknowledged with an empty response.
+    """
+    if func is None:
+        return partial(run_in_process, ack=ack)
+
+    handler_path = f'{func.__module__}:{func.__qualname__}'
+    wants_args = len(signature(func).parameters) > 1
+
+    @wraps(func)
+    def wrapper(rqst, ns_args: Optional[Namespace] = None):
+        ns_dict = None
+        if wants_args and ns_args is not None:
+            ns_dict = {
+                key: value for key, value in vars(ns_args).items()
+                if key != NS_ATTR_RESP
+            }
+
+        future = rqst.app.process_pool.submit(
+            _run_handler,
+            handler_path,
+            RequestSnapshot.from_request(rqst),
+            ns_dict
+        )
+
+        future.add_done_callback(partial(_route_result, rqst))
+        return ack or ''
+
+    return wrapper
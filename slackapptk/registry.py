@@ -0,0 +1,243 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the shared callback registry.  Handlers registered at
+runtime, for example a Modal view callback, are normally bound only to the
+interactive handler emitters of the process that registered them.  When the
+app is run by multiple worker processes, the shared registry records each
+handler by import path and bound arguments in a SQLite database so that any
+worker process can resolve the handler.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Callable, Dict, Tuple
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from functools import partial
+from importlib import import_module
+from threading import Lock
+from time import time, monotonic
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.errors import SlackAppTKError
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'SharedCallbackRegistry',
+    'handler_path'
+]
+
+log = logging.getLogger(__name__)
+
+
+def _import_handler(path: str) -> Callable:
+    module_name, _, qualname = path.partition(':')
+    handler = import_module(module_name)
+    for name in qualname.split('.'):
+        handler = getattr(handler, name)
+
+    return handler
+
+
+def handler_path(handler: Callable) -> str:
+    """
+    Return the import path, "module:qualname", of the handler function.
+
+    Raises
+    ------
+    SlackAppTKError
+        If the handler cannot be imported by that path; for example a lambda
+        or a function defined within another function.
+    """
+    module = getattr(handler, '__module__', None)
+    qualname = getattr(handler, '__qualname__', None)
+    if not (module and qualname):
+        raise SlackAppTKError(f'Handler is not importable: {handler!r}', handler)
+
+    path = f'{module}:{qualname}'
+
+    try:
+        if _import_handler(path) is handler:
+            return path
+
+    except (ImportError, AttributeError):
+        pass
+
+    raise SlackAppTKError(f'Handler is not importable: {path}', handler)
+
+
+class SharedCallbackRegistry(object):
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS callbacks (
+            kind TEXT NOT NULL,
+            event TEXT NOT NULL,
+            handler TEXT NOT NULL,
+            args TEXT NOT NULL,
+            updated REAL NOT NULL,
+            PRIMARY KEY (kind, event)
+        )
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache_ttl: Optional[float] = 30.0
+    ):
+        """
+        Parameters
+        ----------
+        path: str
+            The SQLite database file shared by the app processes.
+
+        cache_ttl: float
+            The number of seconds a resolved handler is cached by the process;
+            "not found" is not cached, so that a handler registered by another
+            process is resolved on the next lookup.
+        """
+        self.path = path
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Tuple[str, str], Tuple[float, Optional[Callable]]] = dict()
+        self._lock = Lock()
+        self._execute(self.SCHEMA)
+
+    def _execute(self, sql, *args):
+        with closing(sqlite3.connect(self.path, timeout=30)) as db, db:
+            return db.execute(sql, args).fetchall()
+
+    def register(
+        self,
+        kind: str,
+        event: str,
+        handler: Callable,
+        *args,
+        **kwargs
+    ) -> None:
+        """
+        Register the handler for the event.
+
+        Parameters
+        ----------
+        kind: str
+            The interactive handler kind, that is the SlackAppInteractiveHandlers
+            attribute name; for example "view" or "block_action".
+
+        event: str
+            The event ID; for example the view callback_id
+
+        handler: Callable
+            A module level handler function
+
+        Other Parameters
+        ----------------
+        Any args and kwargs are JSON serialized and bound to the handler when
+        it is resolved, as functools.partial(handler, *args, **kwargs).  If the
+        handler is a functools.partial, then its function is registered and
+        its bound arguments are stored in the same way.
+
+        Raises
+        ------
+        SlackAppTKError
+            If the handler is not importable, or the arguments are not JSON
+            serializable.
+        """
+        while isinstance(handler, partial):
+            args = handler.args + args
+            kwargs = {**handler.keywords, **kwargs}
+            handler = handler.func
+
+        path = handler_path(handler)
+
+        try:
+            handler_args = json.dumps({'args': args, 'kwargs': kwargs})
+
+        except (TypeError, ValueError) as exc:
+            raise SlackAppTKError(f'Handler arguments are not serializable: {exc}', handler)
+
+        self._execute(
+            'INSERT OR REPLACE INTO callbacks (kind, event, handler, args, updated) '
+            'VALUES (?, ?, ?, ?, ?)',
+            kind, event, path, handler_args, time()
+        )
+
+        with self._lock:
+            self._cache.pop((kind, event), None)
+
+    def unregister(self, kind: str, event: str) -> None:
+        self._execute('DELETE FROM callbacks WHERE kind = ? AND event = ?', kind, event)
+        with self._lock:
+            self._cache.pop((kind, event), None)
+
+    def lookup(self, kind: str, event: str) -> Optional[Callable]:
+        """
+        Resolve the handler for the event.
+
+        Returns
+        -------
+        Callable
+            The handler, with any registered arguments bound.
+        None
+            If no handler is registered.
+        """
+        key = (kind, event)
+        now = monotonic()
+
+        with self._lock:
+            cached = self._cache.get(key)
+
+        if cached and cached[0] > now:
+            return cached[1]
+
+        rows = self._execute(
+            'SELECT handler, args FROM callbacks WHERE kind = ? AND event = ?',
+            kind, event
+        )
+
+        handler = None
+        if rows:
+            path, args = rows[0]
+
+            # a stored handler that no longer resolves, for example after the
+            # app code changed, is treated as not registered.
+
+            try:
+                handler = _import_handler(path)
+
+            except (ImportError, AttributeError) as exc:
+                log.warning(f'Callback for {kind} {event} does not resolve: {path}: {exc}')
+
+            else:
+                args = json.loads(args)
+                if args['args'] or args['kwargs']:
+                    handler = partial(handler, *args['args'], **args['kwargs'])
+
+        if handler is not None:
+            with self._lock:
+                self._cache[key] = (now + self.cache_ttl, handler)
+
+        return handler
@@ -1,11 +1,15 @@
 from typing import NamedTuple, Union, List
+from collections import ChainMap
 
 from slackapptk.errors import SlackAppTKError
+from slackapptk.request.view_inputs import VIEW_INPUT_TYPE_VALUE, register_element_type
 
 __all__ = [
     'ActionEvent',
     'BlockActionEvent',
-    'InteractiveMessageActionEvent'
+    'BlockActionEvents',
+    'InteractiveMessageActionEvent',
+    'register_element_type'
 ]
 
 
@@ -16,56 +20,36 @@ class ActionEvent(NamedTuple):
     type: str
 
 
-def BlockActionEvent(data) -> ActionEvent:
-    a_type = data['type']
-    a_id = data['action_id']
-
-    if a_type == 'button':
-        return ActionEvent(
-            type=a_type, data=data, id=a_id,
-            value=data.get('value') or a_id
-        )
+# Block action element value extractors, keyed by element type.  The input
+# element types are shared with the view input value extractors; use
+# view_inputs.register_element_type to add an element type.
 
-    elif a_type in ['static_select', 'external_select', 'radio_buttons']:
-        a_val = data['selected_option']['value']
-        return ActionEvent(
-            type=a_type, data=data, id=a_id,
-            value=a_val
-        )
+ACTION_TYPE_VALUE = ChainMap({
+    'button': lambda e: e.get('value') or e['action_id'],
+    'overflow': lambda e: e.get('selected_option', {}).get('value'),
+}, VIEW_INPUT_TYPE_VALUE)
 
-    elif a_type in ['checkboxes', 'multi_static_select']:
-        return ActionEvent(
-            type=a_type, data=data, id=a_id,
-            value=[
-                each['value']
-                for each in data['selected_options']
-            ]
-        )
 
-    elif a_type in ['channels_select', 'users_select', 'conversations_select']:
-        if a_type == 'channels_select':
-            a_val = data['selected_channel']
-        elif a_type == 'users_select':
-            a_val = data['selected_user']
-        elif a_type == 'conversations_select':
-            a_val = data['selected_conversation']
+def BlockActionEvent(data) -> ActionEvent:
+    a_type = data['type']
+    get_value = ACTION_TYPE_VALUE.get(a_type)
 
-        return ActionEvent(
-            type=a_type, data=data, id=a_id,
-            value=a_val
+    if not get_value:
+        raise SlackAppTKError(
+            f"Unhandled BlockActionEvent type: {a_type}"
         )
 
-    elif a_type in ['plain_text_input']:
-        a_val = data['value']
+    return ActionEvent(
+        type=a_type, data=data, id=data['action_id'],
+        value=get_value(data)
+    )
 
-        return ActionEvent(
-            type=a_type, data=data, id=a_id,
-            value=a_val
-        )
 
-    raise SlackAppTKError(
-        f"Unhangled BlockActionEvent type: {a_type}"
-    )
+def BlockActionEvents(actions: List[dict]) -> List[ActionEvent]:
+    """
+    Decode all of the actions in a block_actions payload.
+    """
+    return [BlockActionEvent(data) for data in actions]
 
 
 def InteractiveMessageActionEvent(action) -> ActionEvent:
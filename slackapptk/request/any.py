@@ -1,11 +1,45 @@
 from typing import Dict
 from slack.web.client import WebClient
 
-__all__ = ['AnyRequest']
+__all__ = ['AnyRequest', 'lazy_attr']
+
+
+class lazy_attr(object):
+    """
+    A descriptor used by the request classes for attributes that are derived
+    from the request data.  The value is computed on first access and stored
+    in the "_<name>" slot of the instance; the attribute can also be assigned.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.slot = '_' + func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        try:
+            return getattr(obj, self.slot)
+
+        except AttributeError:
+            value = self.func(obj)
+            setattr(obj, self.slot, value)
+            return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
 
 
 class AnyRequest(object):
 
+    __slots__ = (
+        'app', 'rqst_data', 'rqst_type', 'user_id',
+        '_response_url', '_trigger_id', '_channel', '_surface', '_client',
+        '_responder'
+    )
+
     def __init__(
         self,
         app,
@@ -31,16 +65,45 @@ class AnyRequest(object):
         user_id: str
             The Slack User-ID value originating the request.  This value is
             stored in different places depending on the message type.
+
+        Notes
+        -----
+        The attributes derived from the request data, for example `channel`,
+        are computed on first access.
         """
         self.app = app
         self.rqst_data = rqst_data
         self.rqst_type = rqst_type
         self.user_id = user_id
 
-        # default places to look for values in payload
-        self.response_url = self.rqst_data.get('response_url')
-        self.trigger_id = self.rqst_data.get('trigger_id')
-        self.channel = self.rqst_data.get('channel')
-        self.surface = self.rqst_data.get('container')
+    # default places to look for values in payload
+
+    @lazy_attr
+    def response_url(self):
+        return self.rqst_data.get('response_url')
+
+    @lazy_attr
+    def trigger_id(self):
+        return self.rqst_data.get('trigger_id')
+
+    @lazy_attr
+    def channel(self):
+        return self.rqst_data.get('channel')
 
-        self.client = WebClient(token=self.app.config.token)
+    @lazy_attr
+    def surface(self):
+        return self.rqst_data.get('container')
+
+    @lazy_attr
+    def client(self):
+        return WebClient(token=self.app.config.token)
+
+    @lazy_attr
+    def responder(self):
+        """
+        The Responder used to reply to the request.  By default the request is
+        considered acknowledged, so replies are sent via the response_url; the
+        SlashCommandCLI assigns a Responder that replies in the ack body.
+        """
+        from slackapptk.response import Responder
+        return Responder(self, acked=True)
@@ -1,4 +1,5 @@
-from .any import AnyRequest
+from slackapptk.utils.cmdline import parse_command
+from .any import AnyRequest, lazy_attr
 
 __all__ = [
     'AnyRequest',
@@ -7,6 +8,9 @@ __all__ = [
 
 
 class CommandRequest(AnyRequest):
+
+    __slots__ = ('_argv',)
+
     def __init__(
         self,
         app,
@@ -22,5 +26,14 @@ class CommandRequest(AnyRequest):
             user_id=form_data['user_id']
         )
 
-        self.channel = self.rqst_data["channel_id"]
-        self.argv = self.rqst_data['text'].split()
+    @lazy_attr
+    def channel(self):
+        return self.rqst_data["channel_id"]
+
+    @lazy_attr
+    def argv(self):
+        """
+        The command text split into arguments, see utils.cmdline.tokenize;
+        quoted text is a single argument, and Slack entities are decoded.
+        """
+        return list(parse_command(self.rqst_data['command'], self.rqst_data['text']))
@@ -8,6 +8,9 @@ __all__ = [
 
 
 class EventRequest(AnyRequest):
+
+    __slots__ = ('event', 'event_type', 'ts')
+
     def __init__(
         self,
         app,
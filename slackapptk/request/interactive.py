@@ -5,6 +5,7 @@ from slackapptk.errors import SlackAppTKUnhandledRequestError
 from slackapptk.request.action_event import BlockActionEvent, ActionEvent
 from slackapptk.request.view import ViewRequest, View
 from slackapptk.request.outmoded import *
+from slackapptk.request.any import lazy_attr
 
 
 __all__ = [
@@ -17,6 +18,9 @@ __all__ = [
 
 
 class BlockActionRequest(AnyRequest):
+
+    __slots__ = ('_view',)
+
     def __init__(
         self,
         app,
@@ -31,17 +35,27 @@ class BlockActionRequest(AnyRequest):
 
         c_type = self.surface['type']
 
-        if c_type == 'view':
-            # self.view = ViewSurface(payload)
-            self.view = View.from_view(view=payload['view'])
-        elif c_type == 'message':
-            self.channel = self.surface['channel_id']
-        else:
+        if c_type not in ('view', 'message'):
             app.log.error(
                 f'Unknown block action container type: {c_type}'
             )
             app.log.debug(json.dumps(self.rqst_data, indent=3))
 
+    @lazy_attr
+    def view(self):
+        if self.surface['type'] != 'view':
+            raise AttributeError('view')
+
+        # self.view = ViewSurface(payload)
+        return View.from_view(view=self.rqst_data['view'])
+
+    @lazy_attr
+    def channel(self):
+        if self.surface['type'] == 'message':
+            return self.surface['channel_id']
+
+        return self.rqst_data.get('channel')
+
 
 RQST_TYPES = {
     'block_actions': BlockActionRequest,
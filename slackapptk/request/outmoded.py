@@ -1,7 +1,7 @@
 from typing import Dict
 import json
 
-from slackapptk.request.any import AnyRequest
+from slackapptk.request.any import AnyRequest, lazy_attr
 
 __all__ = [
     'AnyRequest',
@@ -11,6 +11,9 @@ __all__ = [
 
 
 class DialogRequest(AnyRequest):
+
+    __slots__ = ('_state',)
+
     def __init__(
         self,
         app,
@@ -37,10 +40,16 @@ class DialogRequest(AnyRequest):
             rqst_data=payload,
             user_id=payload['user']['id']
         )
-        self.state = json.loads(payload.get('state') or '{}')
+
+    @lazy_attr
+    def state(self):
+        return json.loads(self.rqst_data.get('state') or '{}')
 
 
 class InteractiveMessageRequest(AnyRequest):
+
+    __slots__ = ('user_name',)
+
     def __init__(
         self,
         app,
@@ -66,4 +75,7 @@ class InteractiveMessageRequest(AnyRequest):
             user_id=payload['user']['id']
         )
         self.user_name = payload['user']['name']
-        self.channel = payload['channel']['id']
+
+    @lazy_attr
+    def channel(self):
+        return self.rqst_data['channel']['id']
@@ -7,6 +7,9 @@ __all__ = [
 
 
 class OptionSelectRequest(AnyRequest):
+
+    __slots__ = ('value', 'action_id', 'block_id')
+
     def __init__(
         self,
         app,
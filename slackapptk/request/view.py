@@ -1,4 +1,4 @@
-from slackapptk.request.any import AnyRequest
+from slackapptk.request.any import AnyRequest, lazy_attr
 from slackapptk.web.classes.view import View
 
 __all__ = [
@@ -9,6 +9,9 @@ __all__ = [
 
 
 class ViewRequest(AnyRequest):
+
+    __slots__ = ('_view',)
+
     def __init__(
         self,
         app,
@@ -20,4 +23,7 @@ class ViewRequest(AnyRequest):
             rqst_data=payload,
             user_id=payload['user']['id']
         )
-        self.view = View.from_view(view=payload['view'])
+
+    @lazy_attr
+    def view(self):
+        return View.from_view(view=self.rqst_data['view'])
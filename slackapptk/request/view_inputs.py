@@ -5,12 +5,29 @@
 #    element value based on the element type.
 #
 
-__all__ = ['get_input_value']
+import logging
+from typing import Optional, Callable, Dict, Any
+from collections import OrderedDict
+from threading import Lock
+
+__all__ = [
+    'get_input_value',
+    'get_input_values',
+    'register_element_type',
+    'ViewInputExtractor'
+]
+
+log = logging.getLogger(__name__)
 
 
 VIEW_INPUT_TYPE_VALUE = {
     'plain_text_input': lambda e: e.get('value'),
+    'email_text_input': lambda e: e.get('value'),
+    'url_text_input': lambda e: e.get('value'),
+    'number_input': lambda e: e.get('value'),
     'datepicker': lambda e: e.get('selected_date'),
+    'timepicker': lambda e: e.get('selected_time'),
+    'datetimepicker': lambda e: e.get('selected_date_time'),
 
     # single select elements:
     'static_select': lambda e: e.get('selected_option', {}).get('value'),
@@ -25,11 +42,166 @@ VIEW_INPUT_TYPE_VALUE = {
     'multi_external_select': lambda e: [i['value'] for i in e.get('selected_options', {})],
     'multi_users_select': lambda e: e.get('selected_users'),
     'multi_conversations_select': lambda e: e.get('selected_conversations'),
-    'multi_channels_select': lambda e: e.get('selected_channel'),
+    'multi_channels_select': lambda e: e.get('selected_channels'),
     'checkboxes': lambda e: [i['value'] for i in e.get('selected_options', {})]
 }
 
 
+def register_element_type(
+    a_type: str,
+    get_value: Callable[[Dict], Any]
+) -> None:
+    """
+    Register the value extractor for an element type so that the element
+    value is decoded from both view submissions and block actions.
+
+    Parameters
+    ----------
+    a_type: str
+        The element type, for example "rich_text_input"
+
+    get_value: Callable
+        Called with the element payload dict, returns the element value.
+    """
+    VIEW_INPUT_TYPE_VALUE[a_type] = get_value
+
+    # cached extractors may have skipped this element type.
+
+    with _extractor_cache_lock:
+        _extractor_cache.clear()
+
+
 def get_input_value(ele):
     value_type = ele['type']
     return VIEW_INPUT_TYPE_VALUE[value_type](ele)
+
+
+class ViewInputExtractor(object):
+    """
+    A ViewInputExtractor is compiled from the view state values of a
+    view_submission.  The block-id, action-id, and element type layout is
+    recorded together with the value getter for each element so that
+    subsequent submissions of the same view can be extracted in one pass.
+    Elements of an unknown type are skipped.
+    """
+
+    def __init__(self, state_values: Dict):
+        layout = list()
+
+        for block_id, block_ele in state_values.items():
+            for action_id, action_ele in block_ele.items():
+                a_type = action_ele.get('type')
+                getter = VIEW_INPUT_TYPE_VALUE.get(a_type)
+                if not getter:
+                    log.warning(f'Skipping unknown view input type: {a_type}')
+
+                layout.append((block_id, action_id, a_type, getter))
+
+        self.layout = tuple(layout)
+        self.n_blocks = len(state_values)
+        self.n_elements = len(layout)
+
+    def matches(self, state_values: Dict) -> bool:
+        """ True if the state values have the same number of blocks and elements """
+        return (len(state_values) == self.n_blocks and
+                sum(map(len, state_values.values())) == self.n_elements)
+
+    def extract(
+        self,
+        state_values: Dict,
+        by_block: Optional[bool] = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract the input values from the view state values.
+
+        Parameters
+        ----------
+        state_values: dict
+            The view state values.
+
+        by_block: bool
+            When False, the returned dict is keyed by action-id.  When True,
+            the values are grouped in a dict keyed by block-id.
+
+        Returns
+        -------
+        dict
+            The input values.
+        None
+            If the state values do not match the compiled layout.
+        """
+        values = dict()
+
+        # only a missing state value is a layout mismatch; an error raised by
+        # a getter is not masked.
+
+        for block_id, action_id, a_type, getter in self.layout:
+            try:
+                action_ele = state_values[block_id][action_id]
+            except KeyError:
+                return None
+
+            if action_ele.get('type') != a_type:
+                return None
+
+            if not getter:
+                continue
+
+            if by_block:
+                values.setdefault(block_id, {})[action_id] = getter(action_ele)
+            else:
+                values[action_id] = getter(action_ele)
+
+        return values
+
+
+_extractor_cache: Dict[str, ViewInputExtractor] = OrderedDict()
+_extractor_cache_lock = Lock()
+EXTRACTOR_CACHE_SIZE = 256
+
+
+def get_input_values(
+    callback_id: Optional[str],
+    state_values: Dict,
+    by_block: Optional[bool] = False
+) -> Dict[str, Any]:
+    """
+    Extract the input values from the view state values using the extractor
+    cached for the view callback_id; the extractor is compiled on first use,
+    or when the view layout changes.
+
+    Parameters
+    ----------
+    callback_id: str
+        The view callback_id
+
+    state_values: dict
+        The view state values.
+
+    by_block: bool
+        When True, the values are grouped in a dict keyed by block-id.
+
+    Returns
+    -------
+    dict
+        The input values keyed by action-id, or by block-id when by_block.
+    """
+    with _extractor_cache_lock:
+        extractor = _extractor_cache.get(callback_id)
+        if extractor:
+            _extractor_cache.move_to_end(callback_id)
+
+    if extractor and extractor.matches(state_values):
+        values = extractor.extract(state_values, by_block=by_block)
+        if values is not None:
+            return values
+
+    extractor = ViewInputExtractor(state_values)
+
+    if callback_id:
+        with _extractor_cache_lock:
+            _extractor_cache[callback_id] = extractor
+            if len(_extractor_cache) > EXTRACTOR_CACHE_SIZE:
+                _extractor_cache.popitem(last=False)
+
+    return extractor.extract(state_values, by_block=by_block)
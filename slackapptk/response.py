@@ -13,12 +13,16 @@
 #  limitations under the License.
 
 
+from typing import Optional, Any
+from threading import Lock
+
 from slackapptk.messenger import Messenger
 from slackapptk.request.any import AnyRequest
 
 __all__ = [
     'AnyRequest',
     'Response',
+    'Responder',
     'Messenger'
 ]
 
@@ -33,3 +37,73 @@ class Response(Messenger):
         )
 
         self.rqst = rqst
+
+
+class Responder(object):
+    """
+    The Responder replies to a request in the request ack, that is the HTTP
+    response body, when the reply is available before the request is
+    acknowledged.  This avoids a response_url round-trip for replies such as
+    command help or errors.  Once the request is acknowledged, or if a reply
+    has already been given in the ack, any reply is sent via the response_url.
+    """
+
+    def __init__(self, rqst: AnyRequest, acked: Optional[bool] = False):
+        """
+        Parameters
+        ----------
+        rqst: AnyRequest
+            The request the replies are for
+
+        acked: bool
+            True if the request is already acknowledged, so that all replies
+            are sent via the response_url.
+        """
+        self.rqst = rqst
+        self.acked = acked
+        self._body = None
+        self._lock = Lock()
+
+    def send_response(self, **kwargs: Optional[Any]):
+        """
+        Reply to the request; the kwargs are the message content, as with
+        Response.send_response.
+
+        Returns
+        -------
+        True if the reply is kept for the ack body, or otherwise the result
+        of Response.send_response.
+        """
+        with self._lock:
+            if not self.acked and self._body is None:
+                self._body = kwargs
+                return True
+
+        return Response(self.rqst).send_response(**kwargs)
+
+    def ack(self, result: Optional[Any] = None):
+        """
+        Mark the request as acknowledged and return the ack body.
+
+        Parameters
+        ----------
+        result: Any
+            The result of the request handler.  If given, the result is the
+            ack body and any kept reply is sent via the response_url.
+
+        Returns
+        -------
+        The ack body; the handler result, the kept reply, or ''.
+        """
+        with self._lock:
+            self.acked = True
+            body, self._body = self._body, None
+
+        if body is None:
+            return result or ''
+
+        if result:
+            Response(self.rqst).send_response(**body)
+            return result
+
+        return body
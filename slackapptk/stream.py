@@ -0,0 +1,326 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the streaming of command output.  A slash command handler
+that is a generator, or async generator, yields the output in chunks; the
+first chunk is posted as a message, and later chunks are merged into that
+message with rate-limited chat.update calls.  When the message reaches the
+Slack size limits, the output continues in threaded replies.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Union, Iterable, AsyncIterable, List, Dict
+from inspect import isasyncgen
+from queue import Queue, Empty
+from threading import Thread
+from time import sleep
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.web.classes import JsonObject
+
+# -----------------------------------------------------------------------------
+# Private Imports
+# -----------------------------------------------------------------------------
+
+from slackapptk.messenger import Messenger
+from slackapptk.response import Response
+from slackapptk.utils.ratelimit import RateBucket
+from slackapptk.web.classes.builder import BlockBuilder, MAX_MESSAGE_BLOCKS
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'StreamPoster',
+    'stream_output'
+]
+
+# https://api.slack.com/reference/block-kit/blocks#section
+
+MAX_SECTION_TEXT = 3000
+
+# the number of times the output remaining when the stream ends is retried,
+# with an exponential backoff from 1 second.
+
+FINAL_FLUSH_RETRIES = 3
+
+_STREAM_END = object()
+
+
+class _StreamError(object):
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class StreamPoster(object):
+    """
+    The StreamPoster posts the chunks yielded by a command handler.  A chunk
+    is either text, which is formatted as mrkdwn, or a block, or list of
+    blocks.  Consecutive text chunks are merged into one section block.
+
+    The handler is run in its own thread, or on the app I/O loop for an async
+    generator, so that it never waits on Slack API calls; the chunks yielded
+    while a call is in progress are merged into the next call.
+    """
+
+    def __init__(
+        self,
+        rqst,
+        chunks: Union[Iterable, AsyncIterable],
+        channel: Optional[str] = None,
+        interval: Optional[float] = 1.0,
+        max_blocks: Optional[int] = MAX_MESSAGE_BLOCKS,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Parameters
+        ----------
+        rqst: AnyRequest
+            The request the output is for
+
+        chunks: Iterable | AsyncIterable
+            The handler generator, or async generator
+
+        channel: str
+            The channel of the output; by default the request channel
+
+        interval: float
+            The minimum number of seconds between the API calls
+
+        max_blocks: int
+            The maximum number of blocks of each message
+
+        max_bytes: int
+            Optional maximum JSON size of the blocks of each message
+        """
+        self.rqst = rqst
+        self.chunks = chunks
+        self.messenger = Messenger(app=rqst.app, channel=channel or rqst.channel)
+        self.bucket = RateBucket(rate=1 / interval, burst=1)
+        self.builder = BlockBuilder(max_blocks=max_blocks, max_bytes=max_bytes)
+
+        # the channel and ts of each message posted, and the pages changed
+        # since they were last sent.
+
+        self.messages: List[Dict] = list()
+        self._dirty = set()
+        self._last_text: Optional[Dict] = None
+        self._queue = Queue()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> 'StreamPoster':
+        if isasyncgen(self.chunks):
+            self.rqst.app.io.submit(self._produce_async())
+        else:
+            Thread(target=self._produce, daemon=True).start()
+
+        self._thread = Thread(target=self._post, daemon=True)
+        self._thread.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """ wait for all of the output to be posted """
+        self._thread.join(timeout)
+
+    # -------------------------------------------------------------------------
+    # chunk producers
+    # -------------------------------------------------------------------------
+
+    def _produce(self):
+        try:
+            for chunk in self.chunks:
+                self._queue.put(chunk)
+
+        except Exception as exc:
+            self._queue.put(_StreamError(exc))
+
+        self._queue.put(_STREAM_END)
+
+    async def _produce_async(self):
+        try:
+            async for chunk in self.chunks:
+                self._queue.put(chunk)
+
+        except Exception as exc:
+            self._queue.put(_StreamError(exc))
+
+        self._queue.put(_STREAM_END)
+
+    # -------------------------------------------------------------------------
+    # chunk merging
+    # -------------------------------------------------------------------------
+
+    def _add_text(self, text: str):
+        page = self.builder.pages[-1]
+        last = self._last_text
+
+        if page and page[-1] is last:
+            merged = last['text']['text'] + '\n' + text
+            delta = len(merged) - len(last['text']['text'])
+            max_bytes = self.builder.max_bytes
+
+            if len(merged) <= MAX_SECTION_TEXT and (
+                    not max_bytes or self.builder.page_bytes[-1] + delta <= max_bytes):
+                last['text']['text'] = merged
+                self.builder.page_bytes[-1] += delta
+                return
+
+        for start in range(0, len(text) or 1, MAX_SECTION_TEXT):
+            self._last_text = self.builder.add({
+                'type': 'section',
+                'text': {'type': 'mrkdwn', 'text': text[start:start + MAX_SECTION_TEXT] or ' '}
+            })
+
+    def _add(self, chunk):
+        if isinstance(chunk, str):
+            self._add_text(chunk)
+
+        elif isinstance(chunk, (JsonObject, dict)):
+            self.builder.add(chunk)
+
+        else:
+            self.builder.extend(chunk)
+
+    # -------------------------------------------------------------------------
+    # posting
+    # -------------------------------------------------------------------------
+
+    def _post(self):
+        done = False
+
+        while not done:
+            chunks = [self._queue.get()]
+
+            # merge all of the chunks yielded since the last API call
+
+            while True:
+                try:
+                    chunks.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            for chunk in chunks:
+                first_page = len(self.builder.pages) - 1
+
+                if chunk is _STREAM_END:
+                    done = True
+                    break
+
+                if isinstance(chunk, _StreamError):
+                    self.rqst.app.log.error(f'Stream handler failed: {chunk.exc}')
+                    self._add_text(f':x: Your command failed: `{chunk.exc}`')
+                    self._dirty.update(range(first_page, len(self.builder.pages)))
+                    continue
+
+                try:
+                    self._add(chunk)
+
+                except Exception as exc:
+                    self.rqst.app.log.error(f'Stream chunk invalid: {exc}')
+                    self._add_text(f':x: Invalid output: `{exc}`')
+
+                self._dirty.update(range(first_page, len(self.builder.pages)))
+
+            self._flush()
+
+        self._final_flush()
+
+    def _final_flush(self):
+        # the output not posted when the stream ends is not carried by a later
+        # flush; retry it, and if it still fails tell the User the output is
+        # incomplete.
+
+        for attempt in range(FINAL_FLUSH_RETRIES):
+            if self._flush():
+                return
+
+            sleep(2 ** attempt)
+
+        if self._flush():
+            return
+
+        self.rqst.app.log.error(f'Stream output incomplete, {len(self._dirty)} page(s) not posted')
+
+        try:
+            Response(self.rqst).send_response(
+                text=':x: Part of your command output could not be posted.'
+            )
+
+        except Exception as exc:
+            self.rqst.app.log.error(f'Unable to report incomplete stream output: {exc}')
+
+    def _flush(self) -> bool:
+        """ post the changed pages; returns True if all of them were posted """
+        for page_no in sorted(self._dirty):
+            page = self.builder.pages[page_no]
+            if not page:
+                self._dirty.discard(page_no)
+                continue
+
+            self.bucket.acquire()
+
+            try:
+                self._send(page_no, page)
+
+            except Exception as exc:
+                self.rqst.app.log.error(f'Stream post failed: {exc}')
+                return False
+
+            self._dirty.discard(page_no)
+
+        return True
+
+    def _send(self, page_no: int, page: List[Dict]):
+        text = self._fallback_text(page)
+
+        if page_no < len(self.messages):
+            msg = self.messages[page_no]
+            self.messenger.client.chat_update(
+                channel=msg['channel'], ts=msg['ts'], blocks=page, text=text
+            )
+            return
+
+        kwargs = dict(blocks=page, text=text)
+        if self.messages:
+            kwargs['thread_ts'] = self.messages[0]['ts']
+
+        res = self.messenger.send(**kwargs)
+        self.messages.append(dict(channel=res['channel'], ts=res['ts']))
+
+    @staticmethod
+    def _fallback_text(page: List[Dict]) -> str:
+        for block in page:
+            text = block.get('text')
+            if isinstance(text, dict) and text.get('text'):
+                return text['text'][:MAX_SECTION_TEXT]
+
+        return ' '
+
+
+def stream_output(rqst, chunks: Union[Iterable, AsyncIterable], **kwargs) -> StreamPoster:
+    """
+    Post the chunks yielded by the handler generator, or async generator, in
+    the background; see StreamPoster for the kwargs.
+    """
+    return StreamPoster(rqst, chunks, **kwargs).start()
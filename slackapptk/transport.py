@@ -0,0 +1,272 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the synchronous HTTP transport used to POST to the
+response_url of a request, and to call the Web API, without an asyncio event
+loop.  Connections are kept alive in a thread-safe pool so that concurrent
+threads, for example the workers of a sync Flask server, reuse connections
+rather than each opening one per message.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Dict, List, Tuple, Any
+import json
+import ssl
+from http.client import HTTPConnection, HTTPSConnection, HTTPException, RemoteDisconnected
+from threading import Lock, BoundedSemaphore
+from urllib.parse import urlsplit, urlencode
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.web.slack_response import SlackResponse
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'SyncTransport',
+    'TransportResponse'
+]
+
+SLACK_API_URL = 'https://www.slack.com/api/'
+
+# errors that indicate a kept-alive connection was closed by the server; the
+# request is retried once on a new connection.
+
+_STALE_ERRORS = (RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class TransportResponse(dict):
+    """
+    The response of a transport request, a dict with the keys "status_code",
+    "headers", and "data"; the data is the decoded JSON body if the body is
+    JSON, or otherwise the body text.
+    """
+
+    @property
+    def status_code(self) -> int:
+        return self['status_code']
+
+
+class _HostPool(object):
+    """ the idle connections to one host """
+
+    def __init__(self, max_connections: int):
+        self.lock = Lock()
+        self.idle: List[HTTPConnection] = list()
+        self.limit = BoundedSemaphore(max_connections)
+
+
+class SyncTransport(object):
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = 10,
+        timeout: Optional[float] = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None
+    ):
+        """
+        Parameters
+        ----------
+        max_connections: int
+            The maximum number of connections to each host; threads making a
+            request to a host with all connections in use wait for one.
+
+        timeout: float
+            The connection and read timeout in seconds.
+
+        ssl_context: ssl.SSLContext
+            The SSL context of HTTPS connections; by default the system
+            default context.
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._hosts: Dict[Tuple[str, str, int], _HostPool] = dict()
+        self._lock = Lock()
+
+    def _host_pool(self, key) -> _HostPool:
+        with self._lock:
+            pool = self._hosts.get(key)
+            if pool is None:
+                pool = self._hosts[key] = _HostPool(self.max_connections)
+            return pool
+
+    def _connect(self, scheme, host, port) -> HTTPConnection:
+        if scheme == 'https':
+            return HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+
+        return HTTPConnection(host, port, timeout=self.timeout)
+
+    def close(self) -> None:
+        """ close all idle connections """
+        with self._lock:
+            pools, self._hosts = list(self._hosts.values()), dict()
+
+        for pool in pools:
+            with pool.lock:
+                idle, pool.idle = pool.idle, list()
+
+            for conn in idle:
+                conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> TransportResponse:
+        """
+        Make the HTTP request using a pooled connection.
+
+        Returns
+        -------
+        TransportResponse
+
+        Raises
+        ------
+        OSError, HTTPException
+            Upon any connection failure.
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'https'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        pool = self._host_pool(key)
+
+        with pool.limit:
+            with pool.lock:
+                conn = pool.idle.pop() if pool.idle else None
+
+            reused = conn is not None
+
+            while True:
+                if conn is None:
+                    conn = self._connect(*key)
+
+                try:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    resp = conn.getresponse()
+                    data = resp.read()
+
+                except _STALE_ERRORS:
+                    conn.close()
+                    conn = None
+                    if not reused:
+                        raise
+
+                    reused = False
+                    continue
+
+                except (OSError, HTTPException):
+                    conn.close()
+                    raise
+
+                break
+
+            if resp.will_close:
+                conn.close()
+            else:
+                with pool.lock:
+                    pool.idle.append(conn)
+
+        resp_headers = dict(resp.getheaders())
+        content_type = resp_headers.get('Content-Type', resp_headers.get('content-type', ''))
+        text = data.decode('utf-8', errors='replace')
+
+        if content_type.startswith('application/json'):
+            try:
+                text = json.loads(text)
+            except ValueError:
+                pass
+
+        return TransportResponse(status_code=resp.status, headers=resp_headers, data=text)
+
+    def post_json(
+        self,
+        url: str,
+        payload: Dict,
+        token: Optional[str] = None
+    ) -> TransportResponse:
+        """ POST the payload as JSON to the URL, for example a response_url """
+        headers = {'Content-Type': 'application/json;charset=utf-8'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        return self.request('POST', url, body=json.dumps(payload).encode(), headers=headers)
+
+    def api_call(
+        self,
+        token: str,
+        api_method: str,
+        json_body: Optional[Dict] = None,
+        params: Optional[Dict[str, Any]] = None,
+        base_url: Optional[str] = SLACK_API_URL
+    ) -> SlackResponse:
+        """
+        Call the Web API method, for example "chat.postMessage".  The method
+        arguments are given either as the JSON body or, for methods that do not
+        accept JSON, as the form encoded params.
+
+        Returns
+        -------
+        SlackResponse
+
+        Raises
+        ------
+        SlackApiError
+            If the API call fails.
+        """
+        api_url = base_url + api_method
+
+        if json_body is not None:
+            resp = self.post_json(api_url, json_body, token=token)
+            req_args = dict(json=json_body)
+
+        else:
+            resp = self.request(
+                'POST', api_url,
+                body=urlencode(params or {}).encode(),
+                headers={
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                    'Authorization': f'Bearer {token}'
+                }
+            )
+            req_args = dict(data=params)
+
+        data = resp['data'] if isinstance(resp['data'], dict) else {'ok': False, 'error': resp['data']}
+
+        return SlackResponse(
+            client=None,
+            http_verb='POST',
+            api_url=api_url,
+            req_args=req_args,
+            data=data,
+            headers=resp['headers'],
+            status_code=resp.status_code
+        ).validate()
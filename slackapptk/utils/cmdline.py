@@ -0,0 +1,161 @@
+"""
+This file contains the tokenizer used to split the text of a Slack
+/slash-command into the argv list given to the command argument parser.
+"""
+
+from typing import Optional, Tuple
+
+import re
+from functools import lru_cache
+
+
+__all__ = [
+    'ArgToken',
+    'tokenize',
+    'parse_command'
+]
+
+
+class ArgToken(str):
+    """
+    A command argument.  The string value is the decoded argument, and the
+    following attributes describe the origin of the argument.
+
+    Attributes
+    ----------
+    kind: str
+        "text" - plain or quoted text
+        "user" - a user mention, <@U123|name>; the value is the user ID
+        "channel" - a channel reference, <#C123|name>; the value is the channel ID
+        "special" - a special mention, <!here>; the value is "@here"
+        "link" - a link, <https://...|label>; the value is the URL
+
+    raw: str
+        The argument as given in the command text
+
+    label: str
+        The entity label, if any; for example the user name
+    """
+
+    def __new__(
+        cls,
+        value: str,
+        kind: Optional[str] = 'text',
+        raw: Optional[str] = None,
+        label: Optional[str] = None
+    ):
+        token = super().__new__(cls, value)
+        token.kind = kind
+        token.raw = value if raw is None else raw
+        token.label = label
+        return token
+
+
+# a quote groups text only when it opens an argument and is closed at the end
+# of an argument; otherwise it is a literal character, for example the
+# apostrophe of "it's".
+
+_token_re = re.compile(r"""
+    (?P<ws>\s+)
+  | <(?P<ent>[^<>]*)>
+  | (?<!\S)"(?P<dq>[^"]*)"(?!\S)
+  | (?<!\S)“(?P<sdq>[^”]*)”(?!\S)
+  | (?<!\S)'(?P<sq>[^']*)'(?!\S)
+  | (?<!\S)‘(?P<ssq>[^’]*)’(?!\S)
+  | (?P<word>[^\s<]+)
+  | (?P<other>.)
+""", re.VERBOSE)
+
+_html_entities_re = re.compile(r'&(amp|lt|gt);')
+_html_entities = {'amp': '&', 'lt': '<', 'gt': '>'}
+
+
+def _unescape(text: str) -> str:
+    if '&' not in text:
+        return text
+
+    return _html_entities_re.sub(lambda m: _html_entities[m.group(1)], text)
+
+
+def _entity(ent: str) -> ArgToken:
+    raw = f'<{ent}>'
+    ref, _, label = ent.partition('|')
+    label = _unescape(label) or None
+
+    if ref.startswith('@'):
+        return ArgToken(ref[1:], kind='user', raw=raw, label=label)
+
+    if ref.startswith('#'):
+        return ArgToken(ref[1:], kind='channel', raw=raw, label=label)
+
+    if ref.startswith('!'):
+        return ArgToken(label or '@' + ref[1:], kind='special', raw=raw, label=label)
+
+    return ArgToken(_unescape(ref), kind='link', raw=raw, label=label)
+
+
+def tokenize(text: str) -> Tuple[ArgToken, ...]:
+    """
+    Split the command text into arguments in one pass.  Arguments are
+    separated by whitespace; single, double, or "smart" quotes around an
+    argument group text into a single argument, and any other quote is kept
+    as a literal character.  Slack escaped entities are decoded into
+    user, channel, special, or link arguments, and the HTML escaped
+    characters "&amp;", "&lt;", and "&gt;" are decoded.
+
+    Parameters
+    ----------
+    text: str
+        The command text
+
+    Returns
+    -------
+    tuple[ArgToken]
+    """
+    tokens = list()
+    parts = list()
+    raw_start = None
+
+    def flush(raw_end):
+        if not parts:
+            return
+
+        raw = text[raw_start:raw_end]
+        if len(parts) == 1 and isinstance(parts[0], ArgToken):
+            tokens.append(parts[0])
+        else:
+            tokens.append(ArgToken(''.join(parts), raw=raw))
+
+        parts.clear()
+
+    for match in _token_re.finditer(text):
+        group = match.lastgroup
+
+        if group == 'ws':
+            flush(match.start())
+            continue
+
+        if not parts:
+            raw_start = match.start()
+
+        value = match.group(group)
+
+        if group == 'ent':
+            parts.append(_entity(value))
+
+        else:
+            # words and quoted text; quoted text is kept as an argument even
+            # when empty.
+            parts.append(_unescape(value))
+
+    flush(len(text))
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=256)
+def parse_command(command: str, text: str) -> Tuple[ArgToken, ...]:
+    """
+    Tokenize the command text; the results are kept in an LRU cache keyed by
+    the command and text, as Users commonly re-run identical commands.
+    """
+    return tokenize(text)
@@ -1,11 +1,42 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterable, Iterator, Dict
 
 import re
 import fnmatch
 import sre_constants
+from functools import lru_cache
 
 
-__all__ = ['match_maker']
+__all__ = [
+    'match_maker',
+    'compile_pattern',
+    'MatcherSet'
+]
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(
+    pattern: str,
+    regex: Optional[bool] = False
+):
+    """
+    Compile the glob or regex `pattern`, ignoring case.  The compiled
+    patterns are kept in an LRU cache.
+
+    Raises
+    ------
+    ValueError
+        When the pattern is a bad regular expression
+    """
+    if not regex:
+        pattern = fnmatch.translate(pattern)
+
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+
+    except sre_constants.error:
+        raise ValueError(
+            f'Bad regular expression: {pattern}',
+        )
 
 
 def match_maker(
@@ -32,24 +63,156 @@ def match_maker(
     """
 
     # if not regular expression it will be treated as glob wildcard
-    # translate the glob pattern to a regex pattern so we can use
-    # the same regex processing below.
+    # translate the glob pattern to a regex pattern; the pattern matching
+    # ignores case.
 
-    if not regex:
-        pattern = fnmatch.translate(pattern)
-
-    # create the pattern matching ignoring case.
-
-    try:
-        match = re.compile(pattern, re.IGNORECASE).match
-
-    except sre_constants.error:
-        raise ValueError(
-            f'Bad regular expression: {pattern}',
-        )
+    compiled = compile_pattern(pattern, regex)
+    match = compiled.match
 
     def matcher(value):
         return bool(match(value))
 
-    matcher.pattern = pattern
+    matcher.pattern = compiled.pattern
     return matcher
+
+
+_glob_chars_re = re.compile(r'[*?\[]')
+
+# regex constructs that cannot be safely combined into a single alternation
+# expression: group references, named groups, and inline global flags.
+
+_regex_uncombinable_re = re.compile(r'\\[1-9]|\(\?P|\(\?[aiLmsux]+\)')
+
+_TRIE_END = object()
+
+
+class MatcherSet(object):
+    """
+    A MatcherSet is used to match a value against many glob or regex patterns
+    at once.  The patterns are compiled once: literal globs are matched by a
+    dict lookup, prefix globs ("tr*") by a trie, and all other patterns by a
+    single combined alternation regex.  Matching ignores case, as with
+    match_maker.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str],
+        regex: Optional[bool] = False
+    ):
+        """
+        Parameters
+        ----------
+        patterns: Iterable[str]
+            The matching patterns
+
+        regex : bool
+            If True then each pattern is a Python regular expression
+            If False then each pattern is a glob wildcard
+
+        Raises
+        ------
+        ValueError
+            When a pattern is a bad regular expression
+        """
+        self.patterns = tuple(patterns)
+        self.regex = regex
+
+        self._literals: Dict[str, str] = dict()
+        self._prefix_trie = dict()
+        self._combined = None
+        self._singles = list()
+
+        combinable = list()
+
+        for idx, pattern in enumerate(self.patterns):
+            if not regex and not _glob_chars_re.search(pattern):
+                self._literals.setdefault(pattern.lower(), pattern)
+
+            elif (not regex and pattern.endswith('*')
+                  and not _glob_chars_re.search(pattern[:-1])):
+                self._add_prefix(pattern[:-1].lower(), pattern)
+
+            else:
+                compiled = compile_pattern(pattern, regex)
+                if regex and _regex_uncombinable_re.search(pattern):
+                    self._singles.append((compiled.match, pattern))
+                else:
+                    combinable.append((idx, compiled.pattern))
+
+        if combinable:
+            self._groups = {f'_m{idx}': self.patterns[idx] for idx, _ in combinable}
+            combined = '|'.join(f'(?P<_m{idx}>{source})' for idx, source in combinable)
+
+            try:
+                self._combined = re.compile(combined, re.IGNORECASE).match
+
+            except sre_constants.error:
+                self._singles.extend(
+                    (compile_pattern(self.patterns[idx], regex).match, self.patterns[idx])
+                    for idx, _ in combinable
+                )
+
+    def _add_prefix(self, prefix: str, pattern: str):
+        node = self._prefix_trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+
+        node.setdefault(_TRIE_END, pattern)
+
+    def _match_prefix(self, value: str) -> Optional[str]:
+        node = self._prefix_trie
+        if _TRIE_END in node:
+            return node[_TRIE_END]
+
+        for char in value:
+            node = node.get(char)
+            if node is None:
+                return None
+
+            if _TRIE_END in node:
+                return node[_TRIE_END]
+
+        return None
+
+    def match(self, value: str) -> Optional[str]:
+        """
+        Determine which pattern matches `value`.  Literal patterns are checked
+        first, then prefix patterns (shortest first), then all other patterns.
+
+        Returns
+        -------
+        str
+            The pattern that matched
+        None
+            If no pattern matched
+        """
+        lower = value.lower()
+
+        found = self._literals.get(lower)
+        if found is not None:
+            return found
+
+        if self._prefix_trie:
+            found = self._match_prefix(lower)
+            if found is not None:
+                return found
+
+        if self._combined:
+            m = self._combined(value)
+            if m:
+                return self._groups[m.lastgroup]
+
+        for match, pattern in self._singles:
+            if match(value):
+                return pattern
+
+        return None
+
+    def __call__(self, value: str) -> bool:
+        return self.match(value) is not None
+
+    def filter(self, values: Iterable[str]) -> Iterator[str]:
+        """ yield each value that matches any pattern """
+        match = self.match
+        return (value for value in values if match(value) is not None)
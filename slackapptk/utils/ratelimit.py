@@ -0,0 +1,71 @@
+from typing import Optional
+
+from threading import Lock
+from time import monotonic, sleep
+
+
+__all__ = ['RateBucket']
+
+
+class RateBucket(object):
+    """
+    A thread-safe token bucket used to pace outbound api.slack.com calls
+    so that concurrent senders stay within a rate-limit bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None
+    ):
+        """
+        Parameters
+        ----------
+        rate: float
+            The number of calls per second permitted by the bucket.
+
+        burst: int
+            The maximum number of calls that can be made back-to-back
+            before pacing begins.  Defaults to one seconds worth of calls.
+        """
+        if rate <= 0:
+            raise ValueError(f'rate must be positive: {rate}')
+
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._stamp = monotonic()
+        self._lock = Lock()
+
+    def _refill(self):
+        now = monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._stamp) * self.rate
+        )
+        self._stamp = now
+
+    def acquire(self) -> None:
+        """
+        Block the calling thread until a token is available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Drain the bucket so that no token is available for `seconds`; used
+        when api.slack.com responds with a Retry-After value.  Concurrent
+        pauses do not add up; the bucket is paused until the latest one ends.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
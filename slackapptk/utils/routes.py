@@ -0,0 +1,148 @@
+from typing import Optional, Callable, Dict, Tuple, List
+
+import re
+
+from slackapptk.errors import SlackAppTKError
+
+
+__all__ = ['RouteTrie']
+
+
+# route IDs are split into segments on these separator characters; the
+# separators are kept as segments so that "a:b" and "a/b" are distinct.
+
+_route_sep_re = re.compile(r'([:/])')
+_route_param_re = re.compile(r'^{(\w+)}$')
+
+
+class _RouteNode(object):
+    __slots__ = ('children', 'param_name', 'param_node', 'handler', 'template')
+
+    def __init__(self):
+        self.children: Dict[str, '_RouteNode'] = dict()
+        self.param_name = None
+        self.param_node = None
+        self.handler = None
+        self.template = None
+
+
+class RouteTrie(object):
+    """
+    A RouteTrie maps route templates, for example "ticket:{id}" or
+    "device/{name}/action", to handlers.  Templates without parameters are
+    matched by a dict lookup; templates with parameters are compiled into a
+    segment trie so that matching a route ID does not scan each template.
+
+    A parameter matches one whole segment, where segments are separated by
+    ":" or "/".  Literal segments take precedence over parameters.
+    """
+
+    def __init__(self):
+        self._static: Dict[str, Callable] = dict()
+        self._root = _RouteNode()
+
+    def __len__(self):
+        return len(self._static) + self._count(self._root)
+
+    def _count(self, node: _RouteNode) -> int:
+        count = int(node.handler is not None)
+        for child in node.children.values():
+            count += self._count(child)
+
+        if node.param_node:
+            count += self._count(node.param_node)
+
+        return count
+
+    def add(self, template: str, handler: Callable) -> Callable:
+        """
+        Bind the handler to the route template.
+
+        Raises
+        ------
+        SlackAppTKError
+            If the template has a parameter that is not a whole segment, or
+            if the same segment position uses different parameter names.
+        """
+        if '{' not in template:
+            self._static[template] = handler
+            return handler
+
+        node = self._root
+
+        for segment in _route_sep_re.split(template):
+            param = _route_param_re.match(segment)
+
+            if param:
+                name = param.group(1)
+                if node.param_node is None:
+                    node.param_name, node.param_node = name, _RouteNode()
+                elif node.param_name != name:
+                    raise SlackAppTKError(
+                        f'Route {template}: parameter {name} conflicts with {node.param_name}'
+                    )
+
+                node = node.param_node
+                continue
+
+            if '{' in segment or '}' in segment:
+                raise SlackAppTKError(
+                    f'Route {template}: parameter must be a whole segment: {segment}'
+                )
+
+            node = node.children.setdefault(segment, _RouteNode())
+
+        node.handler = handler
+        node.template = template
+        return handler
+
+    def match(self, route_id: str) -> Optional[Tuple[Callable, Dict[str, str]]]:
+        """
+        Match the route ID.
+
+        Returns
+        -------
+        tuple
+            The handler and the dict of extracted parameters.
+        None
+            If no route matches.
+        """
+        handler = self._static.get(route_id)
+        if handler is not None:
+            return handler, {}
+
+        if not (self._root.children or self._root.param_node):
+            return None
+
+        segments = _route_sep_re.split(route_id)
+        params: List[Tuple[str, str]] = list()
+
+        node = self._match(self._root, segments, 0, params)
+        if node is None:
+            return None
+
+        return node.handler, dict(params)
+
+    def _match(self, node, segments, pos, params) -> Optional[_RouteNode]:
+        if pos == len(segments):
+            return node if node.handler is not None else None
+
+        segment = segments[pos]
+
+        child = node.children.get(segment)
+        if child:
+            found = self._match(child, segments, pos + 1, params)
+            if found:
+                return found
+
+        # a parameter does not match a separator, or an empty segment
+
+        if node.param_node and segment and not _route_sep_re.match(segment):
+            params.append((node.param_name, segment))
+            found = self._match(node.param_node, segments, pos + 1, params)
+            if found:
+                return found
+
+            params.pop()
+
+        return None
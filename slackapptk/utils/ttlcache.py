@@ -0,0 +1,122 @@
+from typing import Optional, Callable, Hashable, Any, Dict, Tuple
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic
+
+
+__all__ = ['TTLCache']
+
+
+class TTLCache(object):
+    """
+    A thread-safe LRU cache of computed values that expire ttl seconds after
+    they are computed.  Concurrent requests for the same missing key share a
+    single computation, "single-flight", rather than each computing the value.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: Optional[int] = 128
+    ):
+        """
+        Parameters
+        ----------
+        ttl: float
+            The number of seconds a value is cached.
+
+        maxsize: int
+            The maximum number of values cached; the least recently used
+            values are discarded.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = bool
+    ) -> Any:
+        """
+        Return the cached value of the key; or if it is not cached, or has
+        expired, then the value returned by compute().  An exception raised
+        by compute() is raised to each caller waiting on the key, and nothing
+        is cached.
+
+        A computed value for which cacheable(value) is False, by default a
+        falsy value, is not cached; each caller that was waiting on that
+        computation then calls compute() itself.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > monotonic():
+                self._data.move_to_end(key)
+                return entry[1]
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            cached, value = future.result()
+            return value if cached else compute()
+
+        try:
+            value = compute()
+            cached = cacheable(value)
+
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            if cached:
+                self._data[key] = (monotonic() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+        future.set_result((cached, value))
+        return value
+
+    def invalidate(
+        self,
+        key: Optional[Hashable] = None,
+        predicate: Optional[Callable[[Hashable], bool]] = None
+    ) -> int:
+        """
+        Discard the cached value of the key; or the values of the keys for
+        which predicate(key) is True; or if neither is given, all values.
+
+        Returns
+        -------
+        int
+            The number of values discarded.
+        """
+        with self._lock:
+            if key is not None:
+                return int(self._data.pop(key, None) is not None)
+
+            if predicate is None:
+                count = len(self._data)
+                self._data.clear()
+                return count
+
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+
+            return len(keys)
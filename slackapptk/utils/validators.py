@@ -1,16 +1,47 @@
-from typing import Union, Optional
+from typing import Union, Optional, Iterable, List, NamedTuple
 
 import re
 import ipaddress
 
 
-_mac_char_re = re.compile(r'[0-9a-f]', re.I)
+__all__ = [
+    'validate_macaddr',
+    'validate_macaddr_list',
+    'validate_ipaddress',
+    'validate_ipaddress_list',
+    'ValidateResults',
+    'MACADDR_FORMATS'
+]
+
+_mac_nonhex_re = re.compile(r'[^0-9a-f]', re.I)
+_list_sep_re = re.compile(r'[\s,;]+')
+
+
+MACADDR_FORMATS = {
+    'colon': lambda h: ':'.join((h[0:2], h[2:4], h[4:6], h[6:8], h[8:10], h[10:12])),
+    'hyphen': lambda h: '-'.join((h[0:2], h[2:4], h[4:6], h[6:8], h[8:10], h[10:12])),
+    'dot': lambda h: '.'.join((h[0:4], h[4:8], h[8:12])),
+    'bare': lambda h: h
+}
+
+
+class ValidateResults(NamedTuple):
+    valid: List
+    invalid: List[str]
+
+
+def _as_items(values: Union[str, Iterable[str]]) -> Iterable[str]:
+    # a pasted string of values is split on whitespace, commas, or semicolons
+
+    if isinstance(values, str):
+        return filter(None, _list_sep_re.split(values))
+
+    return values
 
 
-# TODO: add return format option.  Currently hardcodes to "2x:" format.
-#
 def validate_macaddr(
-    macaddr
+    macaddr,
+    fmt: Optional[str] = 'colon'
 ) -> Optional[str]:
     """
     Given `macaddr` string, determine that it is a valid MAC address
@@ -20,20 +51,61 @@ def validate_macaddr(
     ----------
     macaddr: str
 
+    fmt: str
+        The returned format, one of MACADDR_FORMATS:
+            colon  - "xx:xx:xx:xx:xx:xx" (default)
+            hyphen - "xx-xx-xx-xx-xx-xx"
+            dot    - "xxxx.xxxx.xxxx"
+            bare   - "xxxxxxxxxxxx"
+
     Returns
     -------
     None
         If `macaddr` is not a valid MAC address
     str
-        If `macaddr` is a valid MAC address, and the returned
-        format is "xx:xx:xx:xx:xx:xx"
+        If `macaddr` is a valid MAC address, in the `fmt` format
     """
-    char_list = _mac_char_re.findall(macaddr)
-    if len(char_list) != 12:
+    hexchars = _mac_nonhex_re.sub('', macaddr)
+    if len(hexchars) != 12:
         return None
 
-    ch_i = iter(char_list)
-    return ':'.join('%s%s' % (c, next(ch_i)) for c in ch_i)
+    return MACADDR_FORMATS[fmt](hexchars)
+
+
+def validate_macaddr_list(
+    macaddrs: Union[str, Iterable[str]],
+    fmt: Optional[str] = 'colon'
+) -> ValidateResults:
+    """
+    Validate and normalize a list of MAC addresses.
+
+    Parameters
+    ----------
+    macaddrs: str | Iterable[str]
+        The MAC address values.  If a string, the values are separated by
+        whitespace, commas, or semicolons.
+
+    fmt: str
+        The format of the valid MAC addresses; see validate_macaddr.
+
+    Returns
+    -------
+    ValidateResults
+        valid - the list of normalized MAC addresses
+        invalid - the list of given values that are not MAC addresses
+    """
+    formatter = MACADDR_FORMATS[fmt]
+    strip = _mac_nonhex_re.sub
+    valid, invalid = list(), list()
+
+    for macaddr in _as_items(macaddrs):
+        hexchars = strip('', macaddr)
+        if len(hexchars) == 12:
+            valid.append(formatter(hexchars))
+        else:
+            invalid.append(macaddr)
+
+    return ValidateResults(valid=valid, invalid=invalid)
 
 
 def validate_ipaddress(
@@ -61,3 +133,85 @@ def validate_ipaddress(
 
     except ValueError:
         return None
+
+
+def _ip_range(value: str):
+    # "10.0.0.1-10.0.0.20" or "10.0.0.1-20"
+
+    first_s, _, last_s = value.partition('-')
+    first_ip = ipaddress.ip_address(first_s.strip())
+    last_s = last_s.strip()
+
+    if last_s.isdigit() and first_ip.version == 4:
+        last_s = first_s.rpartition('.')[0] + '.' + last_s
+
+    last_ip = ipaddress.ip_address(last_s)
+    if last_ip < first_ip:
+        raise ValueError(value)
+
+    return first_ip, last_ip
+
+
+def validate_ipaddress_list(
+    ipaddrs: Union[str, Iterable[str]],
+    expand: Optional[bool] = False,
+    max_expand: Optional[int] = 65536
+) -> ValidateResults:
+    """
+    Validate a list of IP addresses, CIDR networks, and address ranges.
+
+    Parameters
+    ----------
+    ipaddrs: str | Iterable[str]
+        The IP values.  If a string, the values are separated by whitespace,
+        commas, or semicolons.  Each value is one of:
+            IP address - "10.0.0.1"
+            CIDR network - "10.0.0.0/24"
+            address range - "10.0.0.1-10.0.0.20" or "10.0.0.1-20"
+
+    expand: bool
+        When True, networks and ranges are expanded into the individual
+        IP addresses; host addresses only for networks.  When False, a
+        network is returned as an ipaddress network instance, and a range
+        as the list of networks that summarize it.
+
+    max_expand: int
+        The maximum number of addresses a single network or range may
+        expand into; larger values are invalid.
+
+    Returns
+    -------
+    ValidateResults
+        valid - the list of ipaddress address and network instances
+        invalid - the list of given values that are not valid
+    """
+    valid, invalid = list(), list()
+
+    for value in _as_items(ipaddrs):
+        try:
+            if '/' in value:
+                network = ipaddress.ip_network(value, strict=False)
+                if not expand:
+                    valid.append(network)
+                elif network.num_addresses <= max_expand:
+                    valid.extend(network.hosts())
+                else:
+                    invalid.append(value)
+
+            elif '-' in value:
+                first_ip, last_ip = _ip_range(value)
+                if not expand:
+                    valid.extend(ipaddress.summarize_address_range(first_ip, last_ip))
+                elif int(last_ip) - int(first_ip) < max_expand:
+                    ip_cls = type(first_ip)
+                    valid.extend(ip_cls(ip) for ip in range(int(first_ip), int(last_ip) + 1))
+                else:
+                    invalid.append(value)
+
+            else:
+                valid.append(ipaddress.ip_address(value))
+
+        except (ValueError, TypeError):
+            invalid.append(value)
+
+    return ValidateResults(valid=valid, invalid=invalid)
@@ -0,0 +1,211 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the server-side view state store.  Rather than carrying
+the Modal state in the view private_metadata, which Slack limits to 3000
+characters and which is sent on every view round-trip, the state is kept by
+the app and the private_metadata carries only a short token.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Dict, Tuple
+import json
+import secrets
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from threading import Lock
+from time import time
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = ['ViewStateStore']
+
+
+class ViewStateStore(object):
+    """
+    The ViewStateStore keeps view state dicts keyed by a token.  The state is
+    kept in an in-memory LRU, and optionally persisted in a SQLite database so
+    that the state is shared by multiple app processes and survives a
+    restart.  State expires ttl seconds after it was last saved, and is
+    discarded when the view is closed.
+
+    The store is enabled by assigning it to the app, for example:
+
+        app.view_state = ViewStateStore(path='view_state.db')
+
+    Notes
+    -----
+    When the SQLite database is shared by multiple app processes, set
+    max_items to 0 so that each read is served from the database rather than
+    the process memory.
+    """
+
+    TOKEN_PREFIX = 'tkvs:'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS view_state (
+            token TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            expires REAL NOT NULL
+        )
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_items: Optional[int] = 1024,
+        ttl: Optional[float] = 3600.0
+    ):
+        """
+        Parameters
+        ----------
+        path: str
+            The SQLite database file; if not provided then the state is only
+            kept in memory.
+
+        max_items: int
+            The maximum number of states kept in memory.
+
+        ttl: float
+            The number of seconds a state is kept after it was last saved.
+        """
+        self.path = path
+        self.max_items = max_items
+        self.ttl = ttl
+        self._cache: Dict[str, Tuple[float, Dict]] = OrderedDict()
+        self._lock = Lock()
+        self._purge_at = 0.0
+
+        if path:
+            self._execute(self.SCHEMA)
+
+    def _execute(self, sql, *args):
+        with closing(sqlite3.connect(self.path, timeout=30)) as db, db:
+            return db.execute(sql, args).fetchall()
+
+    # -------------------------------------------------------------------------
+    # token handling
+    # -------------------------------------------------------------------------
+
+    def new_token(self) -> str:
+        return secrets.token_urlsafe(12)
+
+    def to_metadata(self, token: str) -> str:
+        """ return the view private_metadata value that carries the token """
+        return self.TOKEN_PREFIX + token
+
+    def token_of(self, private_metadata) -> Optional[str]:
+        """ return the token carried by the view private_metadata, if any """
+        if isinstance(private_metadata, str) and private_metadata.startswith(self.TOKEN_PREFIX):
+            return private_metadata[len(self.TOKEN_PREFIX):]
+
+        return None
+
+    # -------------------------------------------------------------------------
+    # state access
+    # -------------------------------------------------------------------------
+
+    def get(self, token: str) -> Dict:
+        """
+        Return the state for the token; an empty dict if there is no state or
+        the state has expired.
+        """
+        now = time()
+
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached:
+                if cached[0] > now:
+                    self._cache.move_to_end(token)
+                    return cached[1]
+
+                del self._cache[token]
+
+        if not self.path:
+            return dict()
+
+        rows = self._execute(
+            'SELECT state, expires FROM view_state WHERE token = ?', token
+        )
+
+        if not rows or rows[0][1] <= now:
+            return dict()
+
+        state = json.loads(rows[0][0])
+        self._cache_state(token, rows[0][1], state)
+        return state
+
+    def set(self, token: str, state: Dict) -> None:
+        """
+        Save the state for the token, and restart the token TTL.  If the store
+        is persisted, the state must be JSON serializable.
+        """
+        now = time()
+        expires = now + self.ttl
+
+        if self.path:
+            self._execute(
+                'INSERT OR REPLACE INTO view_state (token, state, expires) VALUES (?, ?, ?)',
+                token, json.dumps(state), expires
+            )
+
+        self._cache_state(token, expires, state)
+
+        if now >= self._purge_at:
+            self._purge_at = now + self.ttl / 10
+            self.purge()
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._cache.pop(token, None)
+
+        if self.path:
+            self._execute('DELETE FROM view_state WHERE token = ?', token)
+
+    def discard_view(self, private_metadata) -> None:
+        """ discard the state of the view carrying the private_metadata, if any """
+        token = self.token_of(private_metadata)
+        if token:
+            self.discard(token)
+
+    def purge(self) -> None:
+        """ remove all expired states """
+        now = time()
+
+        with self._lock:
+            expired = [token for token, (expires, _) in self._cache.items() if expires <= now]
+            for token in expired:
+                del self._cache[token]
+
+        if self.path:
+            self._execute('DELETE FROM view_state WHERE expires <= ?', now)
+
+    def _cache_state(self, token, expires, state):
+        if not self.max_items:
+            return
+
+        with self._lock:
+            self._cache[token] = (expires, state)
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.max_items:
+                self._cache.popitem(last=False)
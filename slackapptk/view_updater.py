@@ -0,0 +1,317 @@
+#  Copyright 2020 Jeremy Schulman, nwkautomaniac@gmail.com
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""
+This file contains the ViewUpdater, used by the SlackApp to coordinate
+views.update calls made against the same view_id from multiple threads.
+"""
+
+# -----------------------------------------------------------------------------
+# System Imports
+# -----------------------------------------------------------------------------
+
+from typing import Optional, Dict, Tuple
+import json
+from hashlib import blake2b
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock
+from time import monotonic, sleep
+
+# -----------------------------------------------------------------------------
+# Public Imports
+# -----------------------------------------------------------------------------
+
+from slack.errors import SlackApiError
+from slack.web.client import WebClient
+
+# -----------------------------------------------------------------------------
+#
+#                                CODE BEGINS
+#
+# -----------------------------------------------------------------------------
+
+__all__ = ['ViewUpdater', 'view_digest']
+
+
+def view_digest(view: Dict) -> bytes:
+    """ return the content hash of the rendered view """
+    payload = json.dumps(view, sort_keys=True, separators=(',', ':'), default=str)
+    return blake2b(payload.encode(), digest_size=16).digest()
+
+
+class _ViewUpdateState(object):
+    """ per view_id update state """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.busy = False
+        self.pending = None
+        self.waiters = list()
+        self.view_hash = None
+        self.last_sent = 0.0
+        self.digest = None
+        self.last_response = None
+
+
+class ViewUpdater(object):
+    """
+    The ViewUpdater serializes the views.update calls made for each view_id.
+    While an update is in-flight, any further updates for the same view_id
+    are coalesced so that only the latest render is sent.  The newest view
+    hash returned by api.slack.com is tracked so that a hash_conflict error
+    can be retried against it.
+
+    The content hash of the last render sent for each view_id, and of the
+    last home tab published for each user, is tracked so that a render that
+    is identical to the last one sent is not sent again.
+    """
+
+    def __init__(
+        self,
+        min_interval: Optional[float] = 0.0,
+        max_retries: Optional[int] = 2,
+        max_views: Optional[int] = 1024
+    ):
+        """
+        Parameters
+        ----------
+        min_interval: float
+            The minimum number of seconds between views.update calls for the
+            same view_id.  Updates made within this interval are coalesced.
+
+        max_retries: int
+            The number of times to retry an update that fails with a
+            hash_conflict error, using the newest tracked view hash.
+
+        max_views: int
+            The maximum number of view_id values tracked; the least recently
+            updated idle views are discarded.
+        """
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.max_views = max_views
+        self._views: Dict[str, _ViewUpdateState] = OrderedDict()
+        self._published: Dict[str, Tuple[bytes, Dict]] = OrderedDict()
+        self._lock = Lock()
+
+    def _get_state(self, view_id: str) -> _ViewUpdateState:
+        with self._lock:
+            state = self._views.get(view_id)
+            if state:
+                self._views.move_to_end(view_id)
+                return state
+
+            state = self._views[view_id] = _ViewUpdateState()
+
+            if len(self._views) > self.max_views:
+                for old_id in [v_id for v_id, v_st in self._views.items()
+                               if not v_st.busy][:len(self._views) - self.max_views]:
+                    del self._views[old_id]
+
+            return state
+
+    def forget(self, view_id: str) -> None:
+        """
+        Discard any tracked state for the view_id, for example on view_closed,
+        or when the view is replaced other than by this updater.  If an update
+        of the view is in progress, only the last render digest is discarded,
+        so that the next render is sent.
+        """
+        with self._lock:
+            state = self._views.get(view_id)
+            if state is None:
+                return
+
+            with state.lock:
+                if state.busy:
+                    state.digest, state.last_response = None, None
+                else:
+                    del self._views[view_id]
+
+    def forget_published(self, user_id: str) -> None:
+        """ discard the last home tab published for the user """
+        with self._lock:
+            self._published.pop(user_id, None)
+
+    def update(
+        self,
+        client: WebClient,
+        view_id: str,
+        view: Dict,
+        view_hash: Optional[str] = None,
+        force: Optional[bool] = False
+    ):
+        """
+        Update the view identified by view_id.  If another thread is currently
+        updating the same view_id, then this view becomes the pending render
+        and the calling thread waits for the call that carries it.
+
+        Parameters
+        ----------
+        client: WebClient
+            The client used to call views.update
+
+        view: dict
+            The rendered view
+
+        view_hash: str
+            The view hash known by the Caller; the newest hash tracked by the
+            updater is used when retrying a hash_conflict.
+
+        force: bool
+            If True, the view is sent even if it is identical to the last
+            render sent.
+
+        Returns
+        -------
+        SlackResponse
+            The response of the views.update call that sent the latest render;
+            if the render is identical to the last one sent, then the response
+            of that call.
+
+        Raises
+        ------
+        SlackApiError
+            Upon any views.update API failure.
+        """
+        state = self._get_state(view_id)
+        future = Future()
+
+        with state.lock:
+            if force:
+                state.digest = None
+
+            state.pending = (client, view, view_hash)
+            state.waiters.append(future)
+            leader = not state.busy
+            state.busy = True
+
+        if leader:
+            self._drain(view_id, state)
+
+        return future.result()
+
+    def _drain(self, view_id, state: _ViewUpdateState):
+        while True:
+            delay = state.last_sent + self.min_interval - monotonic()
+            if delay > 0:
+                sleep(delay)
+
+            with state.lock:
+                if state.pending is None:
+                    state.busy = False
+                    return
+
+                (client, view, view_hash), waiters = state.pending, state.waiters
+                state.pending, state.waiters = None, list()
+
+            try:
+                digest = view_digest(view)
+                if digest == state.digest and state.last_response is not None:
+                    res = state.last_response
+                else:
+                    res = self._send(client, view_id, view, view_hash, state)
+                    state.digest, state.last_response = digest, res
+
+            except Exception as exc:
+                for waiter in waiters:
+                    waiter.set_exception(exc)
+
+            else:
+                for waiter in waiters:
+                    waiter.set_result(res)
+
+    def _send(self, client, view_id, view, view_hash, state: _ViewUpdateState):
+        use_hash = view_hash or state.view_hash
+
+        for attempt in range(self.max_retries + 1):
+            kwargs = dict(view=view, view_id=view_id)
+            if use_hash:
+                kwargs['hash'] = use_hash
+
+            state.last_sent = monotonic()
+
+            try:
+                res = client.views_update(**kwargs)
+
+            except SlackApiError as exc:
+                # retry a hash conflict only if a newer hash is known than the
+                # one that was just rejected.
+
+                if (exc.response.get('error') != 'hash_conflict'
+                        or attempt == self.max_retries
+                        or state.view_hash in (None, use_hash)):
+                    raise
+
+                use_hash = state.view_hash
+                continue
+
+            state.view_hash = res.get('view', {}).get('hash') or state.view_hash
+            return res
+
+    def publish(
+        self,
+        client: WebClient,
+        user_id: str,
+        view: Dict,
+        force: Optional[bool] = False,
+        **kwargs
+    ):
+        """
+        Publish the home tab view for the user.  If the view is identical to
+        the last one published for the user, then views.publish is not called.
+
+        Parameters
+        ----------
+        client: WebClient
+            The client used to call views.publish
+
+        user_id: str
+            The User ID
+
+        view: dict
+            The rendered home tab view
+
+        force: bool
+            If True, the view is published even if it is identical to the
+            last one published.
+
+        Other Parameters
+        ----------------
+        Any other kwargs are passed to views.publish; for example hash.
+
+        Returns
+        -------
+        SlackResponse
+            The response of the views.publish call; if the view is identical
+            to the last one published, then the response of that call.
+        """
+        digest = view_digest(view)
+
+        with self._lock:
+            last = self._published.get(user_id)
+
+        if last and last[0] == digest and not force:
+            return last[1]
+
+        res = client.views_publish(user_id=user_id, view=view, **kwargs)
+
+        with self._lock:
+            self._published[user_id] = (digest, res)
+            self._published.move_to_end(user_id)
+            while len(self._published) > self.max_views:
+                self._published.popitem(last=False)
+
+        return res
@@ -0,0 +1,108 @@
+import json
+from typing import Optional, List, Dict, Iterable, Union
+
+from slack.web.classes import JsonObject
+from slack.web.classes.blocks import Block
+
+from slackapptk.errors import SlackAppTKError
+
+__all__ = [
+    'BlockBuilder',
+    'MAX_MESSAGE_BLOCKS',
+    'MAX_VIEW_BLOCKS'
+]
+
+# https://api.slack.com/reference/block-kit/blocks
+
+MAX_MESSAGE_BLOCKS = 50
+MAX_VIEW_BLOCKS = 100
+
+
+class BlockBuilder(object):
+    """
+    The BlockBuilder is used to accumulate a stream of blocks into "pages" so
+    that no single page exceeds the block count, or optional byte-size, limit
+    of the target Slack surface.  Each block is validated and serialized as it
+    is added, so that an invalid payload is detected before any network I/O.
+    """
+
+    def __init__(
+        self,
+        max_blocks: Optional[int] = MAX_MESSAGE_BLOCKS,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Parameters
+        ----------
+        max_blocks: int
+            The maximum number of blocks per page.
+
+        max_bytes: int
+            If provided, the maximum size of the JSON serialized blocks per
+            page.  Slack does not publish a single byte limit for block
+            payloads, so by default only the block count is enforced.
+        """
+        if max_blocks < 1:
+            raise SlackAppTKError(f'max_blocks must be positive: {max_blocks}')
+
+        self.max_blocks = max_blocks
+        self.max_bytes = max_bytes
+        self.pages: List[List[Dict]] = [[]]
+        self.page_bytes: List[int] = [0]
+
+    def __len__(self):
+        return sum(map(len, self.pages))
+
+    def __iter__(self):
+        return iter(page for page in self.pages if page)
+
+    def add(
+        self,
+        block: Union[Block, Dict]
+    ) -> Dict:
+        """
+        Add the block to the current page, starting a new page if the block
+        would exceed a page limit.
+
+        Returns
+        -------
+        dict
+            The serialized block.
+
+        Raises
+        ------
+        SlackObjectFormationError
+            When the block fails the slackclient validation.
+
+        SlackAppTKError
+            When the block by itself exceeds `max_bytes`.
+        """
+        as_dict = block.to_dict() if isinstance(block, JsonObject) else block
+        size = len(json.dumps(as_dict))
+
+        if self.max_bytes and size > self.max_bytes:
+            raise SlackAppTKError(
+                f'block size {size} exceeds max_bytes {self.max_bytes}',
+                as_dict
+            )
+
+        page = self.pages[-1]
+
+        if page and (len(page) == self.max_blocks or (
+                self.max_bytes and self.page_bytes[-1] + size > self.max_bytes)):
+            page = list()
+            self.pages.append(page)
+            self.page_bytes.append(0)
+
+        page.append(as_dict)
+        self.page_bytes[-1] += size
+        return as_dict
+
+    def extend(
+        self,
+        blocks: Iterable[Union[Block, Dict]]
+    ) -> 'BlockBuilder':
+        for block in blocks:
+            self.add(block)
+
+        return self
@@ -0,0 +1,69 @@
+from typing import Optional, Callable, Dict, List, Union
+from functools import lru_cache, wraps
+
+from slack.web.classes import JsonObject, extract_json
+from slack.web.classes.blocks import Block
+
+__all__ = [
+    'FrozenBlock',
+    'memoize_blocks'
+]
+
+
+class FrozenBlock(Block):
+    """
+    A FrozenBlock wraps a block, or any other Block Kit object, that is
+    validated and serialized once.  The to_dict method returns the cached dict
+    so that a block reused across renders, for example the header of a view
+    that is re-rendered on a timer, is not validated and serialized again.
+
+    The cached dict is shared by each render and must not be modified.
+    """
+
+    attributes = {}  # no attributes because to_dict returns the cached dict
+
+    def __init__(self, block: Union[JsonObject, Dict]):
+        self._as_dict = extract_json(block)
+        self.type = self._as_dict.get('type')
+        self.block_id = self._as_dict.get('block_id')
+
+    def to_dict(self, *args) -> Dict:
+        return self._as_dict
+
+
+def memoize_blocks(
+    func: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = 128
+) -> Callable:
+    """
+    Decorator used to memoize a function that returns a block, or list of
+    blocks, by the function arguments.  Each returned block is frozen, see
+    FrozenBlock, so repeated calls with the same arguments return the blocks
+    without building, validating, or serializing them again; for example:
+
+        @memoize_blocks
+        def device_section(name, status):
+            return SectionBlock(text=f'*{name}*: {status}')
+
+    The function arguments must be hashable.
+    """
+    if func is None:
+        return lambda f: memoize_blocks(f, maxsize=maxsize)
+
+    @lru_cache(maxsize=maxsize)
+    def cached(*args, **kwargs) -> Union[FrozenBlock, List[FrozenBlock]]:
+        blocks = func(*args, **kwargs)
+        if isinstance(blocks, (list, tuple)):
+            return [FrozenBlock(block) for block in blocks]
+
+        return FrozenBlock(blocks)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        blocks = cached(*args, **kwargs)
+        return list(blocks) if isinstance(blocks, list) else blocks
+
+    wrapper.cache_clear = cached.cache_clear
+    wrapper.cache_info = cached.cache_info
+    return wrapper
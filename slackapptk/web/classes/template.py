@@ -0,0 +1,186 @@
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple, Union
+import re
+from collections import ChainMap
+
+from slack.web.classes import JsonObject, extract_json
+
+from slackapptk.errors import SlackAppTKError
+
+__all__ = [
+    'BlockTemplate',
+    'repeat'
+]
+
+_slot_re = re.compile(r'{{\s*(\w+)\s*}}')
+
+
+class repeat(object):
+    """
+    Marks a list of blocks within a BlockTemplate that is repeated for each
+    item of the named slot.  The slot value is an iterable of dicts, and the
+    slots of each repeated block are filled from the item, and then from the
+    template slots.  For example:
+
+        BlockTemplate([
+            SectionBlock(text='*{{title}}*'),
+            repeat('devices', [
+                SectionBlock(text='*{{name}}* is {{status}}')
+            ])
+        ])
+    """
+
+    def __init__(self, name: str, blocks: Iterable[Union[JsonObject, Dict]]):
+        self.name = name
+        self.blocks = list(blocks)
+
+
+def _get_slot(slots: Mapping, name: str):
+    try:
+        return slots[name]
+    except KeyError:
+        raise SlackAppTKError(f'Missing template slot: {name}')
+
+
+def _compile(node) -> Tuple[bool, Any]:
+    """
+    Compile the JSON node.  Returns a tuple of (has_slots, value) where value
+    is the node itself if it has no slots, or otherwise a function that
+    renders the node from the slots.
+    """
+    if isinstance(node, str):
+        parts = _slot_re.split(node)
+        if len(parts) == 1:
+            return False, node
+
+        # a string that is exactly one slot is replaced by the slot value,
+        # which need not be a string; for example a list of options.
+
+        if len(parts) == 3 and not parts[0] and not parts[2]:
+            name = parts[1]
+            return True, lambda slots: _get_slot(slots, name)
+
+        # otherwise, parts alternates between literal text and slot names.
+
+        def render_str(slots):
+            return ''.join(
+                part if not idx % 2 else str(_get_slot(slots, part))
+                for idx, part in enumerate(parts)
+            )
+
+        return True, render_str
+
+    if isinstance(node, dict):
+        compiled = {key: _compile(value) for key, value in node.items()}
+        dynamic = [(key, value) for key, (has_slots, value) in compiled.items() if has_slots]
+        if not dynamic:
+            return False, node
+
+        static = {key: value for key, (has_slots, value) in compiled.items() if not has_slots}
+
+        def render_dict(slots):
+            as_dict = dict(static)
+            for key, render in dynamic:
+                as_dict[key] = render(slots)
+            return as_dict
+
+        return True, render_dict
+
+    if isinstance(node, list):
+        # each compiled item is a tuple of (expands, has_slots, value); a
+        # repeat expands into a list of items.
+
+        compiled = list()
+        for item in node:
+            if isinstance(item, repeat):
+                compiled.append((True, True, _compile_repeat(item)))
+            else:
+                compiled.append((False, *_compile(item)))
+
+        if not any(has_slots for _, has_slots, _ in compiled):
+            return False, node
+
+        def render_list(slots):
+            as_list = list()
+            for expands, has_slots, value in compiled:
+                if expands:
+                    as_list.extend(value(slots))
+                else:
+                    as_list.append(value(slots) if has_slots else value)
+            return as_list
+
+        return True, render_list
+
+    return False, node
+
+
+def _compile_repeat(item: repeat) -> Callable:
+    has_slots, render = _compile(extract_json(item.blocks))
+    name = item.name
+
+    if not has_slots:
+        return lambda slots: render * len(list(_get_slot(slots, name)))
+
+    def render_repeat(slots):
+        as_list = list()
+        for item_slots in _get_slot(slots, name):
+            as_list.extend(render(ChainMap(item_slots, slots)))
+        return as_list
+
+    return render_repeat
+
+
+class BlockTemplate(object):
+    """
+    A BlockTemplate is a Block Kit layout that is validated and serialized
+    once, and then rendered with slot values.  A slot is marked in any string
+    of the layout as "{{name}}"; a string that is only a slot is replaced by
+    the slot value as-is, otherwise the slot value is formatted into the
+    string.  Parts of the layout without slots are shared, by reference, by
+    each render; see repeat() for repeated blocks.
+
+    The rendered blocks are plain dicts, for example:
+
+        devices = BlockTemplate([...])
+
+        Messenger(channel).send(blocks=devices.render(title='Devices', devices=[...]))
+
+        view.blocks = devices.render(title='Devices', devices=[...])
+
+    Notes
+    -----
+    The layout is validated with the slot placeholders in place of the slot
+    values; the slot values are not validated at render time.  The rendered
+    blocks must not be modified since they share the static parts of the
+    layout.
+    """
+
+    def __init__(self, blocks: Union[List, JsonObject, Dict]):
+        """
+        Parameters
+        ----------
+        blocks: list
+            The layout; a list of Block objects, or dicts, and repeat markers.
+            A single Block, or dict, may also be used; in which case the
+            render returns a single dict.
+        """
+        if isinstance(blocks, list):
+            layout = [item if isinstance(item, repeat) else extract_json(item)
+                      for item in blocks]
+        else:
+            layout = extract_json(blocks)
+
+        self._has_slots, self._render = _compile(layout)
+
+    def render(self, **slots) -> Union[List[Dict], Dict]:
+        """
+        Return the blocks with the slots filled by the given values.
+
+        Raises
+        ------
+        SlackAppTKError
+            If a slot value is missing.
+        """
+        if not self._has_slots:
+            return list(self._render) if isinstance(self._render, list) else self._render
+
+        return self._render(slots)